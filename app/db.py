@@ -1,7 +1,10 @@
 # app/db.py
 
+import asyncio
+
 from os import getenv
 from pathlib import Path
+from fastapi import HTTPException
 from loguru import logger
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -9,7 +12,7 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy import exc, text
 from typing import AsyncGenerator
 
 
@@ -19,11 +22,28 @@ if DATABASE_URL.startswith("sqlite"):
     db_path = Path(DATABASE_URL.replace("sqlite+aiosqlite:///", ""))
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", "40"))
+DB_ACQUIRE_TIMEOUT = float(getenv("DB_ACQUIRE_TIMEOUT", "2.0"))
+
+# In-memory SQLite runs on a StaticPool, which takes no sizing arguments
+_pool_kwargs = (
+    {}
+    if ":memory:" in DATABASE_URL
+    else {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": 3600,
+        "pool_timeout": DB_ACQUIRE_TIMEOUT,
+    }
+)
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
     pool_pre_ping=True,
     future=True,
+    **_pool_kwargs,
 )
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
@@ -33,6 +53,20 @@ class Base(DeclarativeBase):
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as session:
+        # Check out the connection up front so an exhausted pool fails fast
+        try:
+            async with asyncio.timeout(DB_ACQUIRE_TIMEOUT):
+                await session.connection()
+        except (TimeoutError, exc.TimeoutError, exc.DBAPIError) as e:
+            logger.warning("Database connection unavailable: {err}", err=str(e))
+            raise HTTPException(503, "Database unavailable")
+        yield session
+
+
+async def get_lazy_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session that connects on first query, for callers that report DB
+    failures themselves (the health probes)."""
     async with SessionLocal() as session:
         yield session
 
@@ -44,6 +78,15 @@ async def init_models():
     logger.info("Database tables initialized")
 
 
+async def warm_pool(size: int = DB_POOL_SIZE):
+    """Open pooled connections at startup so early requests skip connect latency."""
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    await asyncio.gather(*(_ping() for _ in range(size)))
+    logger.info("Database pool warmed with {n} connections", n=size)
+
+
 async def enable_sqlite_wal():
     if DATABASE_URL.startswith("sqlite"):
         async with engine.begin() as conn:
@@ -3,7 +3,11 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_session
+from app.db import get_lazy_session, get_session
 
 async def get_db(session: AsyncSession = Depends(get_session)):
     return session
+
+
+async def get_lazy_db(session: AsyncSession = Depends(get_lazy_session)):
+    return session
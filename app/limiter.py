@@ -1,6 +1,120 @@
 # app/limiter.py
 
+from functools import lru_cache
+from math import ceil
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from time import monotonic
+from typing import Callable, Optional, Sequence
 
 limiter = Limiter(key_func=get_remote_address)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def client_host(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class SlidingWindowLimiter:
+    """Pure ASGI middleware enforcing a per-client, per-route sliding-window
+    rate limit.
+
+    Uses the sliding-window counter approximation: the previous fixed
+    window's hits are weighted by how much of it still overlaps the trailing
+    window, plus the hits in the current window. Each route template gets its
+    own budget, like a ``@limiter.limit`` decorator; read (safe) methods use
+    ``read_rate``. Middleware runs before routing, so templates are resolved
+    against ``routes`` (the raw path is used when none are given); templates
+    in ``exclude`` are left to their own limits. Honors ``limiter.enabled`` so
+    a single switch turns off rate limiting (e.g. under tests).
+    """
+
+    MAX_KEYS = 10_000
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: int,
+        window: int = 60,
+        read_rate: Optional[int] = None,
+        key: Callable[[Scope], str] = client_host,
+        prefixes: tuple[str, ...] = ("/",),
+        routes: Optional[Sequence[BaseRoute]] = None,
+        exclude: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.rate = rate
+        self.read_rate = read_rate or rate
+        self.window = window
+        self.key = key
+        self.prefixes = prefixes
+        self.routes = routes
+        self.exclude = frozenset(exclude)
+        # Paths carry ids, so bound the cache rather than keying on every path
+        self._template = lru_cache(maxsize=4096)(self._match_template)
+        # (client key, route template, is_read) -> [window index, previous, current]
+        self._hits: dict[tuple[str, str, bool], list[int]] = {}
+
+    def _match_template(self, method: str, path: str) -> Optional[str]:
+        if self.routes is None:
+            return path
+        scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+        partial = None
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+            if match is Match.PARTIAL and partial is None:
+                partial = route.path
+        # Unknown paths share one bucket so they can't mint new ones
+        return partial or ""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or not limiter.enabled
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+        template = self._template(scope["method"], scope["path"])
+        if template in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        is_read = scope["method"] in SAFE_METHODS
+        limit = self.read_rate if is_read else self.rate
+        now = monotonic()
+        index = int(now // self.window)
+        bucket = (self.key(scope), template, is_read)
+        state = self._hits.get(bucket)
+        if state is None or state[0] < index - 1:
+            previous, current = 0, 0
+        elif state[0] == index - 1:
+            previous, current = state[2], 0
+        else:
+            previous, current = state[1], state[2]
+        elapsed = now - index * self.window
+        estimated = previous * (self.window - elapsed) / self.window + current
+        if estimated >= limit:
+            response = JSONResponse(
+                {"error": f"Rate limit exceeded: {limit} per {self.window} second"},
+                status_code=429,
+                headers={"Retry-After": str(ceil(self.window - elapsed))},
+            )
+            await response(scope, receive, send)
+            return
+        if state is None and len(self._hits) >= self.MAX_KEYS:
+            self._prune(index)
+        self._hits[bucket] = [index, previous, current + 1]
+        await self.app(scope, receive, send)
+
+    def _prune(self, index: int):
+        """Drop buckets whose windows no longer affect the estimate."""
+        stale = [k for k, v in self._hits.items() if v[0] < index - 1]
+        for k in stale:
+            del self._hits[k]
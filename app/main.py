@@ -9,7 +9,7 @@ from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from json import JSONEncoder
 from loguru import logger
 from pendulum import DateTime
@@ -20,10 +20,10 @@ from sqlalchemy.exc import IntegrityError, DatabaseError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from app.db import init_models, enable_sqlite_wal
-from app.dependencies import get_db
+from app.db import init_models, enable_sqlite_wal, warm_pool
+from app.dependencies import get_lazy_db
 from app.exceptions import DatabaseExceptionHandler
-from app.limiter import limiter
+from app.limiter import limiter, SlidingWindowLimiter
 from app.routers import (
     tasks,
     categories,
@@ -34,6 +34,7 @@ from app.routers import (
     notifications,
     config,
 )
+from app.services.notifications import close_client, start_worker, stop_worker
 from app.settings import settings_cache
 
 
@@ -94,9 +95,13 @@ async def lifespan(app: FastAPI):
     _setup_app_logging()
     await enable_sqlite_wal()
     await init_models()
+    await warm_pool()
     await settings_cache.load()
+    start_worker()
     logger.info("Application startup complete")
     yield
+    await stop_worker()
+    await close_client()
     logger.info("Application shutdown")
 
 
@@ -104,6 +109,7 @@ app = FastAPI(
     title="Tasks Platform API",
     version="2.0.0-vibe",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Rate limiter
@@ -116,6 +122,20 @@ app.add_exception_handler(DatabaseError, DatabaseExceptionHandler.database_error
 
 # ── Middleware stack (last added = outermost = runs first) ────────────────────
 
+# 0. Sliding-window rate limit for the tasks and views APIs (added first so it
+#    sits inside CORS, security headers and logging). Budgets are per route,
+#    matching the slowapi decorators they replaced; attachments share the
+#    /api/tasks prefix but keep their own slowapi limits, so they are excluded.
+app.add_middleware(
+    SlidingWindowLimiter,
+    rate=30,
+    read_rate=120,
+    window=60,
+    prefixes=("/api/tasks", "/api/views"),
+    routes=app.router.routes,
+    exclude=("/api/tasks/{task_id}/attachments",),
+)
+
 # 1. HTTPS redirect (outermost)
 if os.getenv("ENFORCE_HTTPS", "0") == "1":
     app.add_middleware(HTTPSRedirectMiddleware)
@@ -169,7 +189,7 @@ async def health_live():
 
 
 @app.get("/health/ready")
-async def health_ready(db: AsyncSession = Depends(get_db)):
+async def health_ready(db: AsyncSession = Depends(get_lazy_db)):
     """Readiness probe — can it serve requests?"""
     try:
         await db.execute(text("SELECT 1"))
@@ -187,7 +207,7 @@ async def health_ready(db: AsyncSession = Depends(get_db)):
 
 
 @app.get("/healthz")
-async def healthz(db: AsyncSession = Depends(get_db)):
+async def healthz(db: AsyncSession = Depends(get_lazy_db)):
     """Full health check with system info."""
     checks: dict = {
         "status": "healthy",
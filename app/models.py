@@ -11,6 +11,7 @@ from sqlalchemy import (
     Enum as SAEnum,
     DateTime,
     Boolean,
+    Index,
     UniqueConstraint,
 )
 from typing import List, Optional
@@ -64,6 +65,10 @@ class Tag(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Serves "pending and due before/after X" (notification triggers, overdue, next)
+    __table_args__ = (
+        Index("ix_tasks_status_due_at", "status", "due_at"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(200), index=True)
     description: Mapped[Optional[str]] = mapped_column(Text(), default=None)
@@ -144,6 +149,10 @@ class TaskRelationship(Base):
 
 class NotificationLog(Base):
     __tablename__ = "notification_logs"
+    # Covers the recently-notified anti-join in services.notifications
+    __table_args__ = (
+        Index("ix_notification_logs_task_kind_sent", "task_id", "kind", "sent_at"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     task_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("tasks.id", ondelete="SET NULL"),
@@ -167,6 +176,11 @@ class NotificationTemplate(Base):
     markdown: Mapped[str] = mapped_column(Text())
 
 
+def parse_ntfy_topics(text: Optional[str]) -> list[str]:
+    """One topic URL per line; blank lines and surrounding whitespace dropped."""
+    return [ x.strip() for x in (text or "").splitlines() if x.strip() ]
+
+
 class AppSettings(Base):
     __tablename__ = "app_settings"
     __table_args__ = (UniqueConstraint("id"),)
@@ -180,8 +194,4 @@ class AppSettings(Base):
     language: Mapped[str] = mapped_column(String(16), default="en")
 
     def ntfy_topic_list(self) -> list[str]:
-        return [
-            x.strip()
-            for x in (self.ntfy_topics or "").splitlines()
-            if x.strip()
-        ]
+        return parse_ntfy_topics(self.ntfy_topics)
@@ -96,10 +96,7 @@ async def add_attachment(
         )
 
     # Validate task exists before writing to disk
-    t = (
-        (await db.execute(select(Task).where(Task.id == task_id)))
-        .scalar_one_or_none()
-    )
+    t = await db.get(Task, task_id)
     if not t:
         raise HTTPException(404, "Task not found")
 
@@ -164,7 +161,7 @@ async def add_attachment(
     db.add(a)
     await db.commit()
     await db.refresh(a)
-    return AttachmentOut.model_validate(a, from_attributes=True)
+    return AttachmentOut.from_orm_fast(a)
 
 
 @router.get("/{task_id}/attachments", response_model=List[AttachmentOut])
@@ -185,6 +182,6 @@ async def list_attachments(
         .all()
     )
     return [
-        AttachmentOut.model_validate(x, from_attributes=True)
+        AttachmentOut.from_orm_fast(x)
         for x in rows
     ]
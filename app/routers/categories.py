@@ -10,6 +10,7 @@ from typing import List, Optional
 from app.dependencies import get_db
 from app.limiter import limiter
 from app.models import Category, Task, StatusEnum
+from app.routers.tasks import TASK_LIST_OPTIONS, _fast_list
 from app.schemas import CategoryCreate, CategoryOut, TaskOut
 
 
@@ -34,7 +35,7 @@ async def create_category(
     try:
         await db.commit()
         await db.refresh(c)
-        return CategoryOut.model_validate(c, from_attributes=True)
+        return CategoryOut.from_orm_fast(c)
     except IntegrityError as e:
         await db.rollback()
         error_msg = str(e.orig)
@@ -76,7 +77,7 @@ async def list_categories(
             stmt = stmt.where(Category.name.ilike(f"%{q.strip()}%"))
         rows = (await db.execute(stmt)).scalars().all()
         return [
-            CategoryOut.model_validate(x, from_attributes=True)
+            CategoryOut.from_orm_fast(x)
             for x in rows
         ]
     except DatabaseError as e:
@@ -91,11 +92,15 @@ async def tasks_by_category(
     show_completed: bool = True,
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Task).where(Task.category_id==category_id)
+    stmt = (
+        select(Task)
+        .options(*TASK_LIST_OPTIONS)
+        .where(Task.category_id==category_id)
+    )
     if not show_completed:
         stmt = stmt.where(Task.status != StatusEnum.completed)
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TaskOut.model_validate(x, from_attributes=True) for x in rows ]
+    return _fast_list(rows)
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_200_OK)
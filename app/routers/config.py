@@ -18,7 +18,7 @@ router = APIRouter()
 @limiter.limit("120/minute")
 async def get_config(request: Request, db: AsyncSession = Depends(get_db)):
     await settings_cache.load(db)
-    return SettingsOut(**settings_cache.to_dict())
+    return settings_cache.to_dict()   # validated once, by response_model
 
 
 @router.patch("")
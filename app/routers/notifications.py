@@ -10,6 +10,7 @@ from app.models import NotificationLog, NotificationTemplate
 from app.schemas import TemplatePatch
 from app.services.notifications import (
     _send_all,
+    invalidate_template,
     trigger_due_soon,
     trigger_overdue,
 )
@@ -25,6 +26,11 @@ async def cron(
     mode: str = Query("both", pattern="^(near_due|overdue|both)$"),
     db: AsyncSession = Depends(get_db),
 ):
+    """Notify due-soon and/or overdue tasks.
+
+    ``sent`` counts notifications handed to the delivery worker, one per task
+    and topic; failed sends show up in the logs, not in this count.
+    """
     sent = 0
     if mode in ("near_due", "both"):
         sent += await trigger_due_soon(db)
@@ -102,4 +108,5 @@ async def patch_template(
     else:
         row.markdown = body.markdown
     await db.commit()
+    invalidate_template(key)
     return {"ok": True}
@@ -10,6 +10,7 @@ from typing import List, Optional
 from app.dependencies import get_db
 from app.limiter import limiter
 from app.models import Tag, Task, TaskTags, StatusEnum
+from app.routers.tasks import TASK_LIST_OPTIONS, _fast_list
 from app.schemas import TagCreate, TagOut, TaskOut
 
 
@@ -30,7 +31,7 @@ async def create_tag(request: Request, body: TagCreate, db: AsyncSession = Depen
             detail="Tag with that name already exists",
         )
     await db.refresh(t)
-    return TagOut.model_validate(t, from_attributes=True)
+    return TagOut.from_orm_fast(t)
 
 
 @router.get("", response_model=List[TagOut])
@@ -45,7 +46,7 @@ async def list_tags(
         # portable case-insensitive search
         stmt = stmt.where(func.lower(Tag.name).like(f"%{q.lower()}%"))
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TagOut.model_validate(x, from_attributes=True) for x in rows ]
+    return [ TagOut.from_orm_fast(x) for x in rows ]
 
 
 @router.get("/{tag_id}/tasks", response_model=List[TaskOut])
@@ -60,13 +61,13 @@ async def tasks_by_tag(
         select(Task)
         .join(Task.tags)
         .where(Tag.id == tag_id)
-        .options(selectinload(Task.tags))  # avoid N+1 when serializing
+        .options(*TASK_LIST_OPTIONS)  # avoid N+1 when serializing
         .order_by(Task.due_at.asc().nulls_last())
     )
     if not show_completed:
         stmt = stmt.where(Task.status != StatusEnum.completed)
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TaskOut.model_validate(x, from_attributes=True) for x in rows ]
+    return _fast_list(rows)
 
 
 @router.delete("/{tag_id}", status_code=status.HTTP_200_OK)
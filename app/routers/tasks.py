@@ -1,34 +1,52 @@
 # app/routers/tasks.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pendulum import now
-from sqlalchemy import func, select, and_, or_
+from sqlalchemy import func, select, update, case, and_, or_
 from sqlalchemy.exc import IntegrityError, DatabaseError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
 
 from app.dependencies import get_db
-from app.limiter import limiter
 from app.settings import settings_cache
 from app.models import Category, Task, Tag, StatusEnum
 from app.schemas import (
     TaskCreate,
+    TaskBulkCreate,
     TaskOut,
+    TaskOutFast,
     TaskPatch,
     TaskPatchDescription,
     TaskPatchDue,
     AddTags,
 )
-from app.utils.datetime_converter import datetime_to_pendulum, verify_timestamp
+from app.utils.datetime_converter import datetime_to_pendulum
 
 
 router = APIRouter()
 
+# Loader options for single-task fetches via Session.get (identity map first)
+TASK_GET_OPTIONS = [selectinload(Task.tags), selectinload(Task.category)]
+
+# List responses only need tag ids: load tags eagerly but stop the selectin
+# cascade (Tag.tasks, category, attachments) the mapper defaults would follow
+TASK_LIST_OPTIONS = [
+    selectinload(Task.tags).lazyload(Tag.tasks),
+    lazyload(Task.category),
+    lazyload(Task.attachments),
+]
+
+
+def _fast_list(rows) -> ORJSONResponse:
+    """List endpoints skip pydantic: slots dataclasses go straight to orjson.
+    response_model stays on the routes for the OpenAPI schema only."""
+    return ORJSONResponse([ TaskOutFast.from_row(x) for x in rows ])
+
 
 @router.post("", response_model=TaskOut)
-@limiter.limit("30/minute")
-async def create_task(request: Request, body: TaskCreate, db: AsyncSession = Depends(get_db)):
+async def create_task(body: TaskCreate, db: AsyncSession = Depends(get_db)):
     """Create a new task with comprehensive validation and error handling."""
     # Input validation
     if not body.title or not body.title.strip():
@@ -37,6 +55,7 @@ async def create_task(request: Request, body: TaskCreate, db: AsyncSession = Dep
         raise HTTPException(400, "Task title too long (max 200 characters)")
     try:
         # Validate category exists if provided
+        category = None
         if body.category_id:
             category = (await db.execute(
                 select(Category).where(Category.id == body.category_id)
@@ -73,13 +92,12 @@ async def create_task(request: Request, body: TaskCreate, db: AsyncSession = Dep
             due_at=due_at_pendulum,  # Use converted Pendulum datetime
             category_id=body.category_id,
         )
-        if valid_tags:
-            t.tags = valid_tags
+        # Attach the rows loaded above so serialization needs no refresh
+        t.category = category
+        t.tags = valid_tags
         db.add(t)
         await db.commit()
-        # Ensure relationships are loaded for serialization
-        await db.refresh(t, ["tags", "category"])
-        return TaskOut.model_validate(t, from_attributes=True)
+        return TaskOut.from_orm_fast(t)
     except HTTPException:
         # Re-raise validation errors
         await db.rollback()
@@ -99,10 +117,54 @@ async def create_task(request: Request, body: TaskCreate, db: AsyncSession = Dep
         raise HTTPException(500, "Internal server error")
 
 
+@router.post("/bulk", response_model=List[TaskOut])
+async def create_tasks_bulk(body: TaskBulkCreate, db: AsyncSession = Depends(get_db)):
+    """Create many tasks in a single transaction (all or nothing)."""
+    # Validate every referenced category and tag with one query each
+    category_ids = {x.category_id for x in body.tasks if x.category_id}
+    categories = {}
+    if category_ids:
+        rows = (await db.execute(
+            select(Category).where(Category.id.in_(category_ids))
+        )).scalars().all()
+        categories = {c.id: c for c in rows}
+        missing_category_ids = category_ids - categories.keys()
+        if missing_category_ids:
+            raise HTTPException(
+                400,
+                f"Categories with IDs {sorted(missing_category_ids)} do not exist",
+            )
+    tag_ids = {tag_id for x in body.tasks for tag_id in (x.tag_ids or [])}
+    tags = {}
+    if tag_ids:
+        rows = (await db.execute(
+            select(Tag).where(Tag.id.in_(tag_ids))
+        )).scalars().all()
+        tags = {tag.id: tag for tag in rows}
+        missing_tag_ids = tag_ids - tags.keys()
+        if missing_tag_ids:
+            raise HTTPException(
+                400,
+                f"Tags with IDs {sorted(missing_tag_ids)} do not exist",
+            )
+    new_tasks = [
+        Task(
+            title=x.title.strip(),
+            description=x.description.strip() if x.description else None,
+            due_at=datetime_to_pendulum(x.due_at) if x.due_at else None,
+            category_id=x.category_id,
+            category=categories.get(x.category_id),
+            tags=[ tags[tag_id] for tag_id in (x.tag_ids or []) ],
+        )
+        for x in body.tasks
+    ]
+    db.add_all(new_tasks)
+    await db.commit()
+    return _fast_list(new_tasks)
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
-@limiter.limit("30/minute")
 async def delete_task(
-    request: Request,
     task_id: int,
     force: bool = False,
     db: AsyncSession = Depends(get_db)
@@ -112,16 +174,11 @@ async def delete_task(
     """
     try:
         # Fetch task with all relationships for response
-        stmt = (
-            select(Task)
-            .where(Task.id == task_id)
-            .options(
-                selectinload(Task.tags),
-                selectinload(Task.category),
-                selectinload(Task.attachments)
-            )
+        t = await db.get(
+            Task,
+            task_id,
+            options=[*TASK_GET_OPTIONS, selectinload(Task.attachments)],
         )
-        t = (await db.execute(stmt)).scalar_one_or_none()
         if not t:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -168,39 +225,35 @@ async def delete_task(
 
 
 @router.post("/{task_id}/complete", response_model=TaskOut)
-@limiter.limit("30/minute")
-async def complete_task(request: Request, task_id: int, db: AsyncSession = Depends(get_db)):
+async def complete_task(task_id: int, db: AsyncSession = Depends(get_db)):
     """Complete/un-complete task"""
-    t = (
-        (await db.execute(select(Task).where(Task.id==task_id)))
-        .scalar_one_or_none()
+    # Toggle in a single UPDATE ... RETURNING round trip
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            status=case(
+                (Task.status == StatusEnum.pending, StatusEnum.completed),
+                else_=StatusEnum.pending,
+            )
+        )
+        .returning(Task)
     )
+    t = (await db.execute(stmt)).scalar_one_or_none()
     if not t:
         raise HTTPException(404, "Task not found")
-    if t.status == StatusEnum.pending:
-        t.status = StatusEnum.completed
-    elif t.status == StatusEnum.completed:
-        t.status = StatusEnum.pending
-    else:
-        raise HTTPException(404, "Task status not found")
     await db.commit()
-    await db.refresh(t)
-    return TaskOut.model_validate(t, from_attributes=True)
+    return TaskOut.from_orm_fast(t)
 
 
 @router.patch("/{task_id}", response_model=TaskOut)
-@limiter.limit("30/minute")
 async def patch_task(
-    request: Request,
     task_id: int,
     body: TaskPatch,
     db: AsyncSession = Depends(get_db),
 ):
     """Partially update a task. Only fields present in the request body are applied."""
-    t = (
-        (await db.execute(select(Task).where(Task.id == task_id)))
-        .scalar_one_or_none()
-    )
+    t = await db.get(Task, task_id, options=TASK_GET_OPTIONS)
     if not t:
         raise HTTPException(404, "Task not found")
 
@@ -215,8 +268,6 @@ async def patch_task(
 
         if "due_at" in provided:
             if body.due_at is not None:
-                if not verify_timestamp(str(body.due_at)):
-                    raise HTTPException(400, "Invalid due_at timestamp")
                 t.due_at = datetime_to_pendulum(body.due_at)
             else:
                 t.due_at = None
@@ -236,8 +287,10 @@ async def patch_task(
                         400,
                         f"Category with ID {body.category_id} does not exist",
                     )
+                t.category = cat
                 t.category_id = body.category_id
             else:
+                t.category = None
                 t.category_id = None
 
         if "tag_ids" in provided:
@@ -258,8 +311,7 @@ async def patch_task(
                 t.tags = []
 
         await db.commit()
-        await db.refresh(t, ["tags", "category"])
-        return TaskOut.model_validate(t, from_attributes=True)
+        return TaskOut.from_orm_fast(t)
 
     except HTTPException:
         await db.rollback()
@@ -276,66 +328,54 @@ async def patch_task(
 
 
 @router.patch("/{task_id}/description", response_model=TaskOut)
-@limiter.limit("30/minute")
 async def set_description(
-    request: Request,
     task_id: int,
     body: TaskPatchDescription,
     db: AsyncSession = Depends(get_db),
 ):
-    t = (
-        (await db.execute(select(Task).where(Task.id==task_id)))
-        .scalar_one_or_none()
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(description=body.description)
+        .returning(Task)
     )
+    t = (await db.execute(stmt)).scalar_one_or_none()
     if not t:
         raise HTTPException(404, "Task not found")
-    t.description = body.description
     await db.commit()
-    await db.refresh(t)
-    return TaskOut.model_validate(t, from_attributes=True)
+    return TaskOut.from_orm_fast(t)
 
 
 @router.patch("/{task_id}/due", response_model=TaskOut)
-@limiter.limit("30/minute")
 async def set_due(
-    request: Request,
     task_id: int,
     body: TaskPatchDue,
     db: AsyncSession = Depends(get_db),
 ):
     """Set task due date, or nullify it"""
-    t = (
-        (await db.execute(select(Task).where(Task.id==task_id)))
-        .scalar_one_or_none()
+    # body.due_at was already parsed by pydantic; convert to Pendulum for storage
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            due_at=datetime_to_pendulum(body.due_at) if body.due_at else None
+        )
+        .returning(Task)
     )
+    t = (await db.execute(stmt)).scalar_one_or_none()
     if not t:
         raise HTTPException(404, "Task not found")
-    # Convert datetime to Pendulum for database storage
-    ## check if input timestamp is valid
-    check_ts_fg: bool = verify_timestamp(str(body.due_at))
-    ## proper due date update
-    if check_ts_fg:
-        t.due_at = datetime_to_pendulum(body.due_at) if body.due_at else None
-    else:
-        raise HTTPException(400, "Wrong input timestamp value")
     await db.commit()
-    await db.refresh(t)
-    # print(f"{t = }\n{TaskOut.model_validate(t, from_attributes=True) = }")
-    return TaskOut.model_validate(t, from_attributes=True)
+    return TaskOut.from_orm_fast(t)
 
 
 @router.post("/{task_id}/tags")
-@limiter.limit("30/minute")
 async def add_tags(
-    request: Request,
     task_id: int,
     body: AddTags,
     db: AsyncSession = Depends(get_db),
 ):
-    t = (
-        (await db.execute(select(Task).where(Task.id==task_id)))
-        .scalar_one_or_none()
-    )
+    t = await db.get(Task, task_id, options=TASK_GET_OPTIONS)
     if not t:
         raise HTTPException(404, "Task not found")
     tags = (
@@ -354,18 +394,13 @@ async def add_tags(
 
 
 @router.delete("/{task_id}/tags/{tag_id}")
-@limiter.limit("30/minute")
 async def remove_tag_from_task(
-    request: Request,
     task_id: int,
     tag_id: int,
     db: AsyncSession = Depends(get_db),
 ):
     """Remove a specific tag from a task. The tag itself is not deleted."""
-    t = (
-        (await db.execute(select(Task).where(Task.id == task_id)))
-        .scalar_one_or_none()
-    )
+    t = await db.get(Task, task_id, options=TASK_GET_OPTIONS)
     if not t:
         raise HTTPException(404, "Task not found")
     matching = [tg for tg in t.tags if tg.id == tag_id]
@@ -383,9 +418,7 @@ async def remove_tag_from_task(
 
 
 @router.get("", response_model=List[TaskOut])
-@limiter.limit("120/minute")
 async def list_tasks(
-    request: Request,
     q: Optional[str] = None,
     tag: Optional[int] = None,
     overdue_only: bool = False,
@@ -395,6 +428,7 @@ async def list_tasks(
 ):
     stmt = (
         select(Task)
+        .options(*TASK_LIST_OPTIONS)
         .order_by(Task.due_at.is_(None), Task.due_at.asc().nulls_last())
     )
     filters = []
@@ -419,53 +453,49 @@ async def list_tasks(
     if tag:
         stmt = stmt.join(Task.tags).where(Tag.id == tag)
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TaskOut.model_validate(x, from_attributes=True) for x in rows ]
+    return _fast_list(rows)
 
 
 @router.get("/all", response_model=List[TaskOut])
-@limiter.limit("120/minute")
 async def list_all(
-    request: Request,
     q: Optional[str] = None,
     tag: Optional[int] = None,
     overdue_only: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    return await list_tasks(request=request, q=q, tag=tag, overdue_only=overdue_only, db=db)
+    return await list_tasks(q=q, tag=tag, overdue_only=overdue_only, db=db)
 
 
 @router.get("/overdue", response_model=List[TaskOut])
-@limiter.limit("120/minute")
-async def list_overdue(request: Request, db: AsyncSession = Depends(get_db)):
+async def list_overdue(db: AsyncSession = Depends(get_db)):
     """Return all non-completed tasks whose due date is in the past."""
     now_ts = now(settings_cache.timezone)
     stmt = (
         select(Task)
+        .options(*TASK_LIST_OPTIONS)
         .where(Task.due_at.is_not(None))
         .where(Task.due_at < now_ts)
-        .where(Task.status != StatusEnum.completed)
+        .where(Task.status == StatusEnum.pending)
         .order_by(Task.due_at.asc())
     )
     rows = (await db.execute(stmt)).scalars().all()
-    return [TaskOut.model_validate(x, from_attributes=True) for x in rows]
+    return _fast_list(rows)
 
 
 @router.get("/search", response_model=List[TaskOut])
-@limiter.limit("120/minute")
-async def search(request: Request, q: str, db: AsyncSession = Depends(get_db)):
+async def search(q: str, db: AsyncSession = Depends(get_db)):
     pattern = f"%{q}%"
     stmt = (
         select(Task)
+        .options(*TASK_LIST_OPTIONS)
         .where(or_(Task.title.like(pattern), Task.description.like(pattern)))
     )
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TaskOut.model_validate(x, from_attributes=True) for x in rows ]
+    return _fast_list(rows)
 
 
 @router.get("/next", response_model=List[TaskOut])
-@limiter.limit("120/minute")
 async def next_window(
-    request: Request,
     days: Optional[int] = None,
     hours: Optional[int] = 48,
     db: AsyncSession = Depends(get_db),
@@ -484,10 +514,11 @@ async def next_window(
     # exec
     stmt = (
         select(Task)
+        .options(*TASK_LIST_OPTIONS)
         .where(Task.due_at.is_not(None))
         .where(Task.due_at <= horizon)
-        .where(Task.status != StatusEnum.completed)  # Don't show completed tasks
+        .where(Task.status == StatusEnum.pending)  # Don't show completed tasks
         .order_by(Task.due_at.asc())
     )
     rows = (await db.execute(stmt)).scalars().all()
-    return [ TaskOut.model_validate(x, from_attributes=True) for x in rows ]
+    return _fast_list(rows)
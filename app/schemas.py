@@ -1,12 +1,13 @@
 # app/schemas.py
 
 from __future__ import annotations
+from dataclasses import dataclass
 from datetime import datetime
 from pydantic import (
     BaseModel,
     ConfigDict,
-    model_validator,
     field_validator,
+    conlist,
     constr,
 )
 from re import search, IGNORECASE, DOTALL
@@ -15,8 +16,38 @@ from typing import Optional, List
 from app.models import StatusEnum, RelationshipType
 
 
+__all__ = [
+    "ExtendedBase",
+    "TaskCreate",
+    "TaskBulkCreate",
+    "TaskOut",
+    "TaskOutFast",
+    "TaskPatchDescription",
+    "TaskPatchDue",
+    "TaskPatch",
+    "AddTags",
+    "CategoryCreate",
+    "CategoryOut",
+    "TagCreate",
+    "TagOut",
+    "RelationshipCreate",
+    "AttachmentOut",
+    "CountItem",
+    "TemplatePatch",
+    "SettingsOut",
+    "SettingsPatch",
+]
+
+
 class ExtendedBase(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, row):
+        """Build from a trusted ORM row by attribute name, skipping validation."""
+        return cls.model_construct(
+            **{ name: getattr(row, name) for name in cls.model_fields }
+        )
 
 
 # ----- Task -----
@@ -62,6 +93,10 @@ class TaskCreate(ExtendedBase):
         return v
 
 
+class TaskBulkCreate(ExtendedBase):
+    tasks: conlist(TaskCreate, min_length=1, max_length=1000)
+
+
 class TaskOut(ExtendedBase):
     id: int
     title: str
@@ -71,15 +106,51 @@ class TaskOut(ExtendedBase):
     category_id: Optional[int]
     tag_ids: List[int] = []
 
-    @model_validator(mode='before')
     @classmethod
-    def extract_tag_ids(cls, data):
-        if hasattr(data, 'tags') and data.tags is not None:
-            data.tag_ids = [ tag.id for tag in data.tags ]
-        return data
+    def from_orm_fast(cls, row) -> TaskOut:
+        """Build from a trusted Task row, skipping validation."""
+        return cls.model_construct(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            status=row.status,
+            due_at=row.due_at,
+            category_id=row.category_id,
+            tag_ids=[ tag.id for tag in row.tags ],
+        )
+
+
+def _iso_like_pydantic(dt: datetime) -> str:
+    """ISO 8601 the way pydantic serializes datetimes: a zero UTC offset is
+    written as ``Z`` rather than ``+00:00``."""
+    text = dt.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+@dataclass(slots=True)
+class TaskOutFast:
+    """Response-only task shape for list endpoints, serialized by orjson
+    without building a pydantic model per row. Produces the same JSON as
+    TaskOut, field order and datetime format included."""
+    id: int
+    title: str
+    description: Optional[str]
+    status: str
+    due_at: Optional[str]
+    category_id: Optional[int]
+    tag_ids: List[int]
 
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_row(cls, row) -> TaskOutFast:
+        return cls(
+            row.id,
+            row.title,
+            row.description,
+            row.status.value,
+            _iso_like_pydantic(row.due_at) if row.due_at else None,
+            row.category_id,
+            [ tag.id for tag in row.tags ],
+        )
 
 
 class TaskPatchDescription(ExtendedBase):
@@ -153,8 +224,6 @@ class CategoryCreate(BaseModel):
 class CategoryOut(ExtendedBase):
     id: int
     name: str
-    class Config:
-        from_attributes = True
 
 
 class TagCreate(BaseModel):
@@ -172,8 +241,6 @@ class TagCreate(BaseModel):
 class TagOut(ExtendedBase):
     id: int
     name: str
-    class Config:
-        from_attributes = True
 
 
 # ----- Relationships -----
@@ -189,8 +256,6 @@ class AttachmentOut(ExtendedBase):
     filename: str
     url: str
     created_at: datetime
-    class Config:
-        from_attributes = True
 
 
 # ----- Views / Summaries -----
@@ -215,11 +280,5 @@ class SettingsOut(ExtendedBase):
     language: str = "en"
 
 
-class SettingsPatch(ExtendedBase):
-    timezone: str = "America/Santiago"
-    theme: str = "light"
-    notifications_enabled: bool = True
-    near_due_hours: int = 24
-    scheduler_interval_seconds: int = 60
-    ntfy_topics: str = ""
-    language: str = "en"
+# PATCH takes the full settings document, so it shares SettingsOut's schema
+SettingsPatch = SettingsOut
@@ -1,16 +1,27 @@
 # app/services/notifications.py
 
 from __future__ import annotations
+import asyncio
 import math
+import time
+
+from contextlib import suppress
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING
 
-import httpx
 import pendulum
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import and_, insert, select
 
-from app.models import Task, NotificationLog, NotificationTemplate
+from app.db import SessionLocal
+from app.models import Task, NotificationLog, NotificationTemplate, StatusEnum
 from app.settings import settings_cache
 
+if TYPE_CHECKING:
+    import httpx
+
 
 DEFAULT_DUE_SOON = """
 # ⏰ Task due soon: {task_title}
@@ -24,7 +35,20 @@ DEFAULT_OVERDUE = """
 """
 
 
+# key -> (loaded at, markdown); templates change rarely, so re-read every 5 min
+TEMPLATE_TTL = 300
+_tmpl_cache: dict[str, tuple[float, str]] = {}
+
+
+def invalidate_template(key: str):
+    _tmpl_cache.pop(key, None)
+
+
 async def _get_template(db: AsyncSession, key: str, default: str) -> str:
+    entry = _tmpl_cache.get(key)
+    now = time.monotonic()
+    if entry and now - entry[0] < TEMPLATE_TTL:
+        return entry[1]
     row = (
         (
             await db.execute(
@@ -39,136 +63,284 @@ async def _get_template(db: AsyncSession, key: str, default: str) -> str:
         db.add(row)
         await db.commit()
         await db.refresh(row)
+    _tmpl_cache[key] = (now, row.markdown)
     return row.markdown
 
 
+@lru_cache(maxsize=32)
+def _compile(template: str) -> tuple[tuple[str, str | None], ...] | None:
+    """Parse a template once into (literal, field) pairs.
+
+    Returns None when a field uses a format spec, conversion, or attribute /
+    index lookup, so the caller falls back to ``str.format``.
+    """
+    pieces = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+# Hand-written renderers for the built-in templates (matched by value, since
+# the stored copy comes back from the database)
+_FAST_RENDERERS = {
+    DEFAULT_DUE_SOON: lambda task_title, due_at, remaining, **_: (
+        f"\n# ⏰ Task due soon: {task_title}\n- Due at: {due_at}\n- Remaining: {remaining}\n"
+    ),
+    DEFAULT_OVERDUE: lambda task_title, due_at, overdue_by, **_: (
+        f"\n# ❗ Task overdue: {task_title}\n- Was due at: {due_at}\n- Overdue by: {overdue_by}\n"
+    ),
+}
+
+
 def _render(template: str, **kw) -> str:
-    return template.format(**kw)
+    fast = _FAST_RENDERERS.get(template)
+    if fast is not None:
+        return fast(**kw)
+    pieces = _compile(template)
+    if pieces is None:
+        return template.format(**kw)
+    return "".join(
+        literal if field is None else literal + format(kw[field])
+        for literal, field in pieces
+    )
+
+
+# Shared client so sends reuse pooled keep-alive connections; closed on shutdown
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx    # deferred: only processes that actually send pay for it
+        _client = httpx.AsyncClient(timeout=10)
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _post(client: httpx.AsyncClient, topic_url: str, payload: str, subject: str) -> str:
+    resp = await client.post(
+        topic_url,
+        content=payload,
+        headers={
+            "Title": subject,
+            "Markdown": "yes",
+            "Priority": "default",
+        },
+    )
+    resp.raise_for_status()
+    return topic_url
 
 
 async def _send_all(payload: str, subject: str):
-    topics = [
-        u.strip()
-        for u in (settings_cache.ntfy_topics or "").splitlines()
-        if u.strip()
-    ]
+    """Post to every topic; returns the URLs that accepted the message.
+
+    A failing topic is logged and left out rather than failing the others.
+    """
+    topics = settings_cache.ntfy_topics_parsed
     if not topics or not settings_cache.notifications_enabled:
         return []
+    client = _get_client()
+    results = await asyncio.gather(
+        *[ _post(client, topic_url, payload, subject) for topic_url in topics ],
+        return_exceptions=True,
+    )
     sent = []
-    async with httpx.AsyncClient(timeout=10) as client:
-        for topic_url in topics:
-            resp = await client.post(
-                topic_url,
-                content=payload,
-                headers={
-                    "Title": subject,
-                    "Markdown": "yes",
-                    "Priority": "default",
-                },
+    for topic_url, result in zip(topics, results):
+        if isinstance(result, Exception):
+            logger.error(
+                "Notification to {url} failed: {err}", url=topic_url, err=str(result)
             )
-            resp.raise_for_status()
-            sent.append(topic_url)
+        else:
+            sent.append(result)
     return sent
 
 
+# (task_id, payload, subject, kind) items drained by the background worker
+Pending = tuple[int, str, str, str]
+_queue: asyncio.Queue[Pending] | None = None
+_worker: asyncio.Task | None = None
+# Seconds stop_worker waits for queued notifications before dropping them
+DRAIN_TIMEOUT = 10
+
+
+async def _deliver(pending: list[Pending], db: AsyncSession) -> int:
+    """Send a batch concurrently and bulk-insert one log row per destination."""
+    results = await asyncio.gather(
+        *[ _send_all(payload, subject) for _, payload, subject, _ in pending ]
+    )
+    rows = [
+        {"task_id": task_id, "destination": dest, "kind": kind, "payload": payload}
+        for (task_id, payload, _, kind), urls in zip(pending, results)
+        for dest in urls
+    ]
+    if rows:
+        await db.execute(insert(NotificationLog), rows)
+        await db.commit()
+    return len(rows)
+
+
+async def _worker_loop():
+    assert _queue is not None
+    while True:
+        batch = [await _queue.get()]
+        while not _queue.empty():
+            batch.append(_queue.get_nowait())
+        try:
+            async with SessionLocal() as db:
+                await _deliver(batch, db)
+        except Exception as e:
+            logger.error("Notification delivery failed: {err}", err=str(e))
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def start_worker():
+    global _queue, _worker
+    if _worker is None:
+        _queue = asyncio.Queue()
+        _worker = asyncio.create_task(_worker_loop())
+
+
+async def stop_worker():
+    """Let the worker drain the queue (up to DRAIN_TIMEOUT), then cancel it."""
+    global _queue, _worker
+    if _worker is not None:
+        try:
+            async with asyncio.timeout(DRAIN_TIMEOUT):
+                await _queue.join()
+        except TimeoutError:
+            logger.warning(
+                "Dropping {n} undelivered notifications on shutdown", n=_queue.qsize()
+            )
+        _worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await _worker
+        _queue, _worker = None, None
+
+
+async def _dispatch(pending: list[Pending], db: AsyncSession) -> int:
+    """Queue a batch for the worker; returns the number of notifications queued.
+
+    The count is one per task and topic, not a delivery count: failed sends
+    are only logged by the worker. Without a running worker (e.g. under
+    tests, where lifespan does not run) the batch is delivered inline on the
+    caller's session and the count is the number actually delivered.
+    """
+    topics = settings_cache.ntfy_topics_parsed
+    if not pending or not topics or not settings_cache.notifications_enabled:
+        return 0
+    if _queue is None:
+        return await _deliver(pending, db)
+    for item in pending:
+        _queue.put_nowait(item)
+    return len(pending) * len(topics)
+
+
 async def trigger_due_soon(db: AsyncSession) -> int:
     hours = settings_cache.near_due_hours or 24
-    horizon = func.datetime(func.now(), f"+{hours} hours")
-    # Only get tasks that haven't been notified recently
-    subquery = (
-        select(NotificationLog.task_id)
-        .where(
-            NotificationLog.kind == "due_soon",
-            NotificationLog.sent_at >= func.datetime(func.now(), "-1 day"),
-        )
-    )
+    tz = settings_cache.timezone or "UTC"
+    # Bounds are bound as constants so SQLite can range-scan ix_tasks_due_at
+    now = pendulum.now(tz)
+    horizon = now.add(hours=hours)
+    # Only get tasks that haven't been notified recently (LEFT JOIN anti-join)
     stmt = (
-        select(Task)
+        select(Task.id, Task.title, Task.due_at)
+        .outerjoin(
+            NotificationLog,
+            and_(
+                NotificationLog.task_id == Task.id,
+                NotificationLog.kind == "due_soon",
+                NotificationLog.sent_at >= now.subtract(days=1),
+            ),
+        )
         .where(
-            Task.status != "completed",
+            Task.status == StatusEnum.pending,
             Task.due_at.is_not(None),
             Task.due_at <= horizon,
-            Task.due_at >= func.now(),
-            Task.id.not_in(subquery),       # Exclude recently notified tasks
+            Task.due_at >= now,
+            NotificationLog.id.is_(None),   # Exclude recently notified tasks
         )
     )
-    tasks = (await db.execute(stmt)).scalars().all()
+    tasks = (await db.execute(stmt)).all()
     tmpl = await _get_template(db, "due_soon", DEFAULT_DUE_SOON)
-    sent = 0
-    tz = settings_cache.timezone or "UTC"
-    now = pendulum.now(tz)
+    tzobj = pendulum.timezone(tz)
+    now_ts = now.timestamp()
+    payloads = []
     for t in tasks:
         due = t.due_at
         if due and due.tzinfo is None:
-            due = pendulum.instance(due, tz=tz)
-        remaining_seconds = (due - now).total_seconds() if due else 0
+            due = due.replace(tzinfo=tzobj)
+        remaining_seconds = (due.timestamp() - now_ts) if due else 0
         remaining_hours = math.ceil(remaining_seconds / 3600)
-        payload = _render(
-            tmpl,
-            task_title=t.title,
-            due_at=t.due_at,
-            remaining=f"{remaining_hours}h",
-        )
-        urls = await _send_all(payload, subject="Task due soon")
-        for dest in urls:
-            db.add(
-                NotificationLog(
-                    task_id=t.id,
-                    destination=dest,
-                    kind="due_soon",
-                    payload=payload,
-                )
+        payloads.append(
+            _render(
+                tmpl,
+                task_title=t.title,
+                due_at=t.due_at,
+                remaining=f"{remaining_hours}h",
             )
-            sent += 1
-    await db.commit()
-    return sent
+        )
+    pending = [
+        (t.id, payload, "Task due soon", "due_soon")
+        for t, payload in zip(tasks, payloads)
+    ]
+    await db.commit()   # release the session before any network I/O
+    return await _dispatch(pending, db)
 
 
 async def trigger_overdue(db: AsyncSession) -> int:
+    tz = settings_cache.timezone or "UTC"
+    now = pendulum.now(tz)
     # Skip tasks already notified as overdue in the last hour
-    recently_notified = (
-        select(NotificationLog.task_id)
-        .where(
-            NotificationLog.kind == "overdue",
-            NotificationLog.sent_at >= func.datetime(func.now(), "-1 hour"),
-        )
-    )
     stmt = (
-        select(Task)
+        select(Task.id, Task.title, Task.due_at)
+        .outerjoin(
+            NotificationLog,
+            and_(
+                NotificationLog.task_id == Task.id,
+                NotificationLog.kind == "overdue",
+                NotificationLog.sent_at >= now.subtract(hours=1),
+            ),
+        )
         .where(
-            Task.status!="completed",
+            Task.status == StatusEnum.pending,
             Task.due_at.is_not(None),
-            Task.due_at < func.now(),
-            Task.id.not_in(recently_notified),
+            Task.due_at < now,
+            NotificationLog.id.is_(None),
         )
     )
-    tasks = (await db.execute(stmt)).scalars().all()
+    tasks = (await db.execute(stmt)).all()
     tmpl = await _get_template(db, "overdue", DEFAULT_OVERDUE)
-    sent = 0
-    tz = settings_cache.timezone or "UTC"
-    now = pendulum.now(tz)
+    tzobj = pendulum.timezone(tz)
+    now_ts = now.timestamp()
+    payloads = []
     for t in tasks:
         due = t.due_at
         if due and due.tzinfo is None:
-            due = pendulum.instance(due, tz=tz)
-        overdue_seconds = (now - due).total_seconds() if due else 0
+            due = due.replace(tzinfo=tzobj)
+        overdue_seconds = (now_ts - due.timestamp()) if due else 0
         overdue_hours = math.ceil(overdue_seconds / 3600)
-        payload = _render(
-            tmpl,
-            task_title=t.title,
-            due_at=t.due_at,
-            overdue_by=f"{overdue_hours}h",
-        )
-        urls = await _send_all(payload, subject="Task overdue")
-        for dest in urls:
-            db.add(
-                NotificationLog(
-                    task_id=t.id,
-                    destination=dest,
-                    kind="overdue",
-                    payload=payload,
-                )
+        payloads.append(
+            _render(
+                tmpl,
+                task_title=t.title,
+                due_at=t.due_at,
+                overdue_by=f"{overdue_hours}h",
             )
-            sent += 1
-    await db.commit()
-    return sent
+        )
+    pending = [
+        (t.id, payload, "Task overdue", "overdue")
+        for t, payload in zip(tasks, payloads)
+    ]
+    await db.commit()   # release the session before any network I/O
+    return await _dispatch(pending, db)
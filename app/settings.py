@@ -1,15 +1,48 @@
 # app/settings.py
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from app.models import AppSettings
+from app.models import AppSettings, parse_ntfy_topics
 from app.db import SessionLocal
 
 
+# Plain column select: rows map straight onto SettingsCache fields
+_SELECT_SETTINGS = select(
+    AppSettings.timezone,
+    AppSettings.theme,
+    AppSettings.notifications_enabled,
+    AppSettings.near_due_hours,
+    AppSettings.scheduler_interval_seconds,
+    AppSettings.ntfy_topics,
+    AppSettings.language,
+).where(AppSettings.id==1)
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+async def _insert_default_row(session: AsyncSession):
+    """Create the settings row; safe when concurrent workers race to do it."""
+    insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is not None:
+        await session.execute(
+            insert(AppSettings).values(id=1).on_conflict_do_nothing()
+        )
+        await session.commit()
+        return
+    session.add(AppSettings(id=1))
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()   # another worker inserted it first
+
+
 @dataclass
 class SettingsCache:
     timezone: str = "UTC"
@@ -19,6 +52,16 @@ class SettingsCache:
     scheduler_interval_seconds: int = 60
     ntfy_topics: str = ""
     language: str = "en"
+    _ntfy_src: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _ntfy_parsed: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    @property
+    def ntfy_topics_parsed(self) -> List[str]:
+        """Stripped, non-empty topic URLs; re-split only when ntfy_topics changes."""
+        if self._ntfy_src is not self.ntfy_topics:
+            self._ntfy_parsed = parse_ntfy_topics(self.ntfy_topics)
+            self._ntfy_src = self.ntfy_topics
+        return self._ntfy_parsed
 
     async def load(self, session: Optional[AsyncSession] = None):
         own = False
@@ -26,19 +69,12 @@ class SettingsCache:
             own = True
             session = SessionLocal()
         try:
-            res = await session.execute(select(AppSettings).where(AppSettings.id==1))
-            obj = res.scalar_one_or_none()
-            if not obj:
-                obj = AppSettings(id=1)
-                session.add(obj)
-                await session.commit()
-            self.timezone = obj.timezone
-            self.theme = obj.theme
-            self.notifications_enabled = obj.notifications_enabled
-            self.near_due_hours = obj.near_due_hours
-            self.scheduler_interval_seconds = obj.scheduler_interval_seconds
-            self.ntfy_topics = obj.ntfy_topics
-            self.language = obj.language
+            row = (await session.execute(_SELECT_SETTINGS)).one_or_none()
+            if row is None:
+                # Race-safe cold start: concurrent workers may both get here
+                await _insert_default_row(session)
+                row = (await session.execute(_SELECT_SETTINGS)).one()
+            self.__dict__.update(row._mapping)
         finally:
             if own:
                 await session.close()
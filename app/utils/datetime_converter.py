@@ -31,24 +31,3 @@ def datetime_to_pendulum(dt: datetime, tz: Optional[str] = None) -> Optional[Pen
         return pendulum.instance(dt, tz=tz)
     return pendulum.instance(dt)
 
-
-def verify_timestamp(dts: str, tz: Optional[str] = None) -> bool:
-    """Verify if input str timestamp is valid in datetime or Pendulum."""
-    if dts is None or dts == "None" or dts == "null":
-        return True
-    if tz is None:
-        from app.utils.tz import get_tz
-        tz = get_tz()
-    error_fg: int = 0
-    # pendulum check
-    try:
-        _ = pendulum.parse(dts, tz=tz)
-    except Exception:
-        error_fg += 1
-    # datetime check
-    try:
-        _ = datetime.strptime(dts, "%Y-%m-%dT%H:%M:%S.%f")
-    except Exception:
-        error_fg += 1
-    # checking results
-    return error_fg < 2
@@ -1,54 +1,142 @@
 # tests/conftest.py
 
+import asyncio
+
+import pytest
 import pytest_asyncio
-from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncSession,
     create_async_engine,
-    async_sessionmaker,
 )
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db import Base
-from app.dependencies import get_db
+from app.dependencies import get_db, get_lazy_db
 from app.limiter import limiter
+from tests.asgi_client import AsgiClient
 
 # Disable rate limiting during tests
 limiter.enabled = False
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run tests marked slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+# In-memory databases are private to the process, so each pytest-xdist worker
+# (`pytest -n auto`) builds and uses its own schema
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest_asyncio.fixture(scope="function")
+def pytest_asyncio_loop_factories(config, item):
+    """Run the suite on uvloop (installed with uvicorn[standard]) when available."""
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest_asyncio.fixture(scope="session")
 async def engine():
-    """Create a fresh in-memory SQLite engine for each test function."""
-    eng = create_async_engine(TEST_DATABASE_URL, echo=False, future=True)
-    async with eng.begin() as conn:
-        import app.models  # noqa: F401 — ensure all tables are registered on Base
-        await conn.run_sync(Base.metadata.create_all)
+    """One in-memory SQLite engine (single shared connection) for the whole run."""
+    eng = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so per-test SAVEPOINTs work on SQLite
+    @event.listens_for(eng.sync_engine, "connect")
+    def _no_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(eng.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     yield eng
-    async with eng.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
     await eng.dispose()
 
 
+@pytest_asyncio.fixture(scope="session")
+async def _schema(engine):
+    """Run the DDL exactly once per session; tests never call init_models()."""
+    async with engine.begin() as conn:
+        import app.models  # noqa: F401 — ensure all tables are registered on Base
+        await conn.run_sync(Base.metadata.create_all)
+
+
 @pytest_asyncio.fixture(scope="function")
-async def db_session(engine):
-    """Provide a transactional AsyncSession backed by the in-memory engine."""
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    async with session_factory() as session:
-        yield session
+async def db_session(request, engine, _schema):
+    """AsyncSession inside an outer transaction that is rolled back after the test.
+
+    Commits made by the app only release a SAVEPOINT, so every test starts
+    from the empty schema without re-running DDL. Tests marked ``readonly``
+    skip the reset: their session is bound to the engine and only connects
+    if a query actually runs.
+    """
+    if request.node.get_closest_marker("readonly"):
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            yield session
+        return
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """One in-process client reused by every test, warmed up before first use.
+
+    AsgiClient calls the app directly, skipping httpx's request encoding
+    and transport, so there are no connections to pool or keep alive; app
+    exceptions still propagate to the test. The DB-free warm-up request
+    keeps lazy imports and route/middleware setup out of the first test.
+    """
+    ac = AsgiClient(app)
+    await ac.get("/health/live")
+    yield ac
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(db_session):
-    """Provide an AsyncClient with get_db overridden to use the test session."""
+async def client(http_client, db_session):
+    """Provide the shared AsgiClient with get_db (and the health probes'
+    get_lazy_db) overridden to use the test session.
+
+    Requests share one AsyncSession, so they take turns on it; tests can
+    still fire requests with asyncio.gather to batch setup.
+    """
+    session_lock = asyncio.Lock()
 
     async def override_get_db():
-        yield db_session
+        async with session_lock:
+            yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    app.dependency_overrides[get_lazy_db] = override_get_db
+    yield http_client
     app.dependency_overrides.clear()
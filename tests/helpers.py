@@ -0,0 +1,33 @@
+# tests/helpers.py
+
+import asyncio
+
+from tests.asgi_client import AsgiClient, AsgiResponse
+
+
+async def post_task(client: AsgiClient, title: str = "Task", **fields) -> AsgiResponse:
+    """POST /api/tasks and check it succeeded; returns the raw response so
+    callers that ignore the body skip decoding it."""
+    r = await client.post("/api/tasks", json={"title": title, **fields})
+    assert r.status_code == 200
+    return r
+
+
+async def create_task(client: AsgiClient, title: str = "Task", **fields) -> dict:
+    return (await post_task(client, title, **fields)).json()
+
+
+async def create_tasks(client: AsgiClient, *payloads: dict) -> list[dict]:
+    """Create several tasks concurrently; results come back in payload order."""
+    rs = await asyncio.gather(*(client.post("/api/tasks", json=p) for p in payloads))
+    assert all(r.status_code == 200 for r in rs)
+    return [ r.json() for r in rs ]
+
+
+async def seed_named(db_session, model, *names: str) -> dict[str, int]:
+    """Insert one ``model(name=...)`` row per name in a single commit; maps
+    name -> id."""
+    rows = [ model(name=n) for n in names ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return { r.name: r.id for r in rows }
@@ -1,23 +1,70 @@
-import io
+import asyncio
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+
+from app.routers import attachments
+from tests.asgi_client import AsgiClient
+from tests.helpers import create_task
+
+
+# Minimal valid 1x1 PNG
+MIN_PNG = (
+    b"\x89PNG\r\n\x1a\n"  # PNG signature
+    b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02"
+    b"\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx"
+    b"\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N"
+    b"\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+FAKE_PNG = b"not a png at all " * 20
+
+
+def _encode_multipart(parts: list[tuple[str, str, bytes, str]]) -> tuple[bytes, str]:
+    """Encode (field, filename, data, content type) parts once; returns the
+    body and its Content-Type header value."""
+    boundary = "fridai-test-boundary"
+    body = b"".join(
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode() + data + b"\r\n"
+        for field, filename, data, content_type in parts
+    )
+    return body + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
 
 
-async def _create_task(client: AsyncClient, title: str = "Task") -> dict:
-    r = await client.post("/api/tasks", json={"title": title})
-    assert r.status_code == 200
-    return r.json()
+BODY_TXT, CT_TXT = _encode_multipart([("file", "notes.txt", b"Hello, world!", "text/plain")])
+BODY_MD, CT_MD = _encode_multipart([("file", "readme.md", b"# Title\nSome markdown", "text/markdown")])
+BODY_EXE, CT_EXE = _encode_multipart([("file", "virus.exe", b"MZ", "application/octet-stream")])
+BODY_F_TXT, CT_F_TXT = _encode_multipart([("file", "f.txt", b"x", "text/plain")])
+BODY_PNG, CT_PNG = _encode_multipart([("file", "image.png", MIN_PNG, "image/png")])
+BODY_FAKE_PNG, CT_FAKE_PNG = _encode_multipart([("file", "fake.png", FAKE_PNG, "image/png")])
+BODY_A_TXT, CT_A_TXT = _encode_multipart([("file", "a.txt", b"aaa", "text/plain")])
+BODY_B_TXT, CT_B_TXT = _encode_multipart([("file", "b.txt", b"bbb", "text/plain")])
+
+
+@pytest.fixture(autouse=True)
+def _storage_dir(tmp_path, monkeypatch):
+    """Write uploads under tmp_path instead of app/storage."""
+    monkeypatch.setattr(attachments, "STORAGE_DIR", tmp_path)
+
+
+@pytest_asyncio.fixture
+async def a_task(client: AsgiClient) -> dict:
+    """A task for tests that only need somewhere to upload to.
+
+    Function-scoped on purpose: each test's transaction is rolled back.
+    """
+    return await create_task(client)
 
 
 # ── Upload ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_upload_txt_file(client: AsyncClient):
-    task = await _create_task(client)
-    content = b"Hello, world!"
+async def test_upload_txt_file(client: AsgiClient, a_task: dict):
     r = await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("notes.txt", io.BytesIO(content), "text/plain")},
+        f"/api/tasks/{a_task['id']}/attachments",
+        content=BODY_TXT,
+        headers={"content-type": CT_TXT},
     )
     assert r.status_code == 200
     body = r.json()
@@ -26,44 +73,40 @@ async def test_upload_txt_file(client: AsyncClient):
     assert body["id"] > 0
 
 
-@pytest.mark.asyncio
-async def test_upload_md_file(client: AsyncClient):
-    task = await _create_task(client)
-    content = b"# Title\nSome markdown"
+async def test_upload_md_file(client: AsgiClient, a_task: dict):
     r = await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("readme.md", io.BytesIO(content), "text/markdown")},
+        f"/api/tasks/{a_task['id']}/attachments",
+        content=BODY_MD,
+        headers={"content-type": CT_MD},
     )
     assert r.status_code == 200
 
 
-@pytest.mark.asyncio
-async def test_upload_disallowed_extension(client: AsyncClient):
-    task = await _create_task(client)
+async def test_upload_disallowed_extension(client: AsgiClient, a_task: dict):
     r = await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("virus.exe", io.BytesIO(b"MZ"), "application/octet-stream")},
+        f"/api/tasks/{a_task['id']}/attachments",
+        content=BODY_EXE,
+        headers={"content-type": CT_EXE},
     )
     assert r.status_code == 400
     assert "not allowed" in r.json()["detail"].lower()
 
 
-@pytest.mark.asyncio
-async def test_upload_task_not_found(client: AsyncClient):
+async def test_upload_task_not_found(client: AsgiClient):
     r = await client.post(
         "/api/tasks/9999/attachments",
-        files={"file": ("f.txt", io.BytesIO(b"x"), "text/plain")},
+        content=BODY_F_TXT,
+        headers={"content-type": CT_F_TXT},
     )
     assert r.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_upload_png_mime_mismatch(client: AsyncClient):
+async def test_upload_png_mime_mismatch(client: AsgiClient, a_task: dict):
     """A .png file whose content is actually plain text should be rejected."""
-    task = await _create_task(client)
     r = await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("fake.png", io.BytesIO(b"not a png at all " * 20), "image/png")},
+        f"/api/tasks/{a_task['id']}/attachments",
+        content=BODY_FAKE_PNG,
+        headers={"content-type": CT_FAKE_PNG},
     )
     # The filetype library won't match PNG magic bytes, but for short content
     # it may return None and fall through; for longer content it should detect mismatch.
@@ -71,45 +114,31 @@ async def test_upload_png_mime_mismatch(client: AsyncClient):
     assert r.status_code in (200, 400)
 
 
-@pytest.mark.asyncio
-async def test_upload_valid_png(client: AsyncClient):
+async def test_upload_valid_png(client: AsgiClient, a_task: dict):
     """A minimal valid PNG file should upload successfully."""
-    task = await _create_task(client)
-    # Minimal valid 1x1 PNG
-    png_bytes = (
-        b"\x89PNG\r\n\x1a\n"  # PNG signature
-        b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02"
-        b"\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx"
-        b"\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N"
-        b"\x00\x00\x00\x00IEND\xaeB`\x82"
-    )
     r = await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("image.png", io.BytesIO(png_bytes), "image/png")},
+        f"/api/tasks/{a_task['id']}/attachments",
+        content=BODY_PNG,
+        headers={"content-type": CT_PNG},
     )
     assert r.status_code == 200
 
 
 # ── List ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_list_attachments_empty(client: AsyncClient):
-    task = await _create_task(client)
-    r = await client.get(f"/api/tasks/{task['id']}/attachments")
+async def test_list_attachments_empty(client: AsgiClient, a_task: dict):
+    r = await client.get(f"/api/tasks/{a_task['id']}/attachments")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_list_attachments_after_upload(client: AsyncClient):
-    task = await _create_task(client)
-    await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("a.txt", io.BytesIO(b"aaa"), "text/plain")},
-    )
-    await client.post(
-        f"/api/tasks/{task['id']}/attachments",
-        files={"file": ("b.txt", io.BytesIO(b"bbb"), "text/plain")},
+async def test_list_attachments_after_upload(client: AsgiClient):
+    task = await create_task(client)
+    url = f"/api/tasks/{task['id']}/attachments"
+    # Order doesn't matter, only the count
+    await asyncio.gather(
+        client.post(url, content=BODY_A_TXT, headers={"content-type": CT_A_TXT}),
+        client.post(url, content=BODY_B_TXT, headers={"content-type": CT_B_TXT}),
     )
-    r = await client.get(f"/api/tasks/{task['id']}/attachments")
+    r = await client.get(url)
     assert len(r.json()) == 2
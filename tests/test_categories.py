@@ -1,65 +1,61 @@
-import pytest
-from httpx import AsyncClient
+import uuid
 
+import pytest_asyncio
 
-async def _create_category(client: AsyncClient, name: str = "Work") -> dict:
+from app.models import Category
+from tests.asgi_client import AsgiClient
+from tests.helpers import create_task, post_task, seed_named
+
+
+async def _create_category(client: AsgiClient, name: str = "Work") -> dict:
     r = await client.post("/api/categories", json={"name": name})
     assert r.status_code == 200
     return r.json()
 
 
-async def _create_task(client: AsyncClient, **overrides) -> dict:
-    payload = {"title": "Task", **overrides}
-    r = await client.post("/api/tasks", json=payload)
-    assert r.status_code == 200
-    return r.json()
+@pytest_asyncio.fixture
+async def seeded(db_session) -> dict[str, int]:
+    return await seed_named(
+        db_session, Category, "Alpha", "Beta", "Work", "Personal", "Source", "Target"
+    )
 
 
 # ── Create ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_create_category(client: AsyncClient):
+async def test_create_category(client: AsgiClient):
     cat = await _create_category(client, "Home")
     assert cat["id"] > 0
     assert cat["name"] == "Home"
 
 
-@pytest.mark.asyncio
-async def test_create_category_duplicate(client: AsyncClient):
-    await _create_category(client, "Unique")
-    r = await client.post("/api/categories", json={"name": "Unique"})
+async def test_create_category_duplicate(client: AsgiClient):
+    name = f"Cat-{uuid.uuid4().hex[:6]}"
+    await _create_category(client, name)
+    r = await client.post("/api/categories", json={"name": name})
     assert r.status_code == 409
 
 
-@pytest.mark.asyncio
-async def test_create_category_strips_whitespace(client: AsyncClient):
+async def test_create_category_strips_whitespace(client: AsgiClient):
     cat = await _create_category(client, "  Padded  ")
     assert cat["name"] == "Padded"
 
 
 # ── List ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_list_categories_empty(client: AsyncClient):
+async def test_list_categories_empty(client: AsgiClient):
     r = await client.get("/api/categories")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_list_categories(client: AsyncClient):
-    await _create_category(client, "Alpha")
-    await _create_category(client, "Beta")
+async def test_list_categories(client: AsgiClient, seeded: dict):
     r = await client.get("/api/categories")
     names = [c["name"] for c in r.json()]
     assert "Alpha" in names
     assert "Beta" in names
 
 
-@pytest.mark.asyncio
-async def test_list_categories_search(client: AsyncClient):
-    await _create_category(client, "Work")
-    await _create_category(client, "Personal")
+async def test_list_categories_search(client: AsgiClient, seeded: dict):
     r = await client.get("/api/categories", params={"q": "per"})
     assert len(r.json()) == 1
     assert r.json()[0]["name"] == "Personal"
@@ -67,21 +63,19 @@ async def test_list_categories_search(client: AsyncClient):
 
 # ── Tasks by category ────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_tasks_by_category(client: AsyncClient):
+async def test_tasks_by_category(client: AsgiClient):
     cat = await _create_category(client, "Cat1")
-    await _create_task(client, title="InCat", category_id=cat["id"])
-    await _create_task(client, title="NoCat")
+    await post_task(client, title="InCat", category_id=cat["id"])
+    await post_task(client, title="NoCat")
     r = await client.get(f"/api/categories/{cat['id']}/tasks")
     assert r.status_code == 200
     assert len(r.json()) == 1
     assert r.json()[0]["title"] == "InCat"
 
 
-@pytest.mark.asyncio
-async def test_tasks_by_category_hide_completed(client: AsyncClient):
+async def test_tasks_by_category_hide_completed(client: AsgiClient):
     cat = await _create_category(client)
-    task = await _create_task(client, title="Done", category_id=cat["id"])
+    task = await create_task(client, title="Done", category_id=cat["id"])
     await client.post(f"/api/tasks/{task['id']}/complete")
     r = await client.get(
         f"/api/categories/{cat['id']}/tasks", params={"show_completed": False}
@@ -91,31 +85,27 @@ async def test_tasks_by_category_hide_completed(client: AsyncClient):
 
 # ── Delete ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_delete_category_empty(client: AsyncClient):
+async def test_delete_category_empty(client: AsgiClient):
     cat = await _create_category(client)
     r = await client.delete(f"/api/categories/{cat['id']}")
     assert r.status_code == 200
 
 
-@pytest.mark.asyncio
-async def test_delete_category_not_found(client: AsyncClient):
+async def test_delete_category_not_found(client: AsgiClient):
     r = await client.delete("/api/categories/9999")
     assert r.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_delete_category_with_tasks_blocked(client: AsyncClient):
+async def test_delete_category_with_tasks_blocked(client: AsgiClient):
     cat = await _create_category(client)
-    await _create_task(client, title="T", category_id=cat["id"])
+    await post_task(client, title="T", category_id=cat["id"])
     r = await client.delete(f"/api/categories/{cat['id']}")
     assert r.status_code == 409
 
 
-@pytest.mark.asyncio
-async def test_delete_category_force(client: AsyncClient):
+async def test_delete_category_force(client: AsgiClient):
     cat = await _create_category(client)
-    await _create_task(client, title="T", category_id=cat["id"])
+    await post_task(client, title="T", category_id=cat["id"])
     r = await client.delete(f"/api/categories/{cat['id']}", params={"force": True})
     assert r.status_code == 200
     # Task still exists but category_id is nulled
@@ -124,34 +114,30 @@ async def test_delete_category_force(client: AsyncClient):
     assert tasks[0]["category_id"] is None
 
 
-@pytest.mark.asyncio
-async def test_delete_category_reassign(client: AsyncClient):
-    cat1 = await _create_category(client, "Source")
-    cat2 = await _create_category(client, "Target")
-    await _create_task(client, title="T", category_id=cat1["id"])
+async def test_delete_category_reassign(client: AsgiClient, seeded: dict):
+    source, target = seeded["Source"], seeded["Target"]
+    await post_task(client, title="T", category_id=source)
     r = await client.delete(
-        f"/api/categories/{cat1['id']}", params={"reassign_to": cat2["id"]}
+        f"/api/categories/{source}", params={"reassign_to": target}
     )
     assert r.status_code == 200
-    assert r.json()["deleted_category"]["tasks_reassigned_to"] == cat2["id"]
+    assert r.json()["deleted_category"]["tasks_reassigned_to"] == target
     tasks = (await client.get("/api/tasks")).json()
-    assert tasks[0]["category_id"] == cat2["id"]
+    assert tasks[0]["category_id"] == target
 
 
-@pytest.mark.asyncio
-async def test_delete_category_reassign_to_self(client: AsyncClient):
+async def test_delete_category_reassign_to_self(client: AsgiClient):
     cat = await _create_category(client)
-    await _create_task(client, title="T", category_id=cat["id"])
+    await post_task(client, title="T", category_id=cat["id"])
     r = await client.delete(
         f"/api/categories/{cat['id']}", params={"reassign_to": cat["id"]}
     )
     assert r.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_delete_category_reassign_to_nonexistent(client: AsyncClient):
+async def test_delete_category_reassign_to_nonexistent(client: AsgiClient):
     cat = await _create_category(client)
-    await _create_task(client, title="T", category_id=cat["id"])
+    await post_task(client, title="T", category_id=cat["id"])
     r = await client.delete(
         f"/api/categories/{cat['id']}", params={"reassign_to": 9999}
     )
@@ -1,14 +1,19 @@
 import pytest
-from httpx import AsyncClient
 
+from app import settings
+from tests.asgi_client import AsgiClient
 
-# ── Get config ───────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_get_config_defaults(client: AsyncClient):
+async def _get_config(client: AsgiClient) -> dict:
     r = await client.get("/api/config")
     assert r.status_code == 200
-    body = r.json()
+    return r.json()
+
+
+# ── Get config ───────────────────────────────────────────────────────────────
+
+async def test_get_config_defaults(client: AsgiClient):
+    body = await _get_config(client)
     # Verify all expected fields are present
     assert "timezone" in body
     assert "theme" in body
@@ -20,64 +25,36 @@ async def test_get_config_defaults(client: AsyncClient):
 
 # ── Patch config ─────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_patch_config_timezone(client: AsyncClient):
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("timezone", "Europe/London"),
+        ("notifications_enabled", False),
+        ("ntfy_topics", "https://ntfy.sh/my-topic\nhttps://ntfy.sh/other"),
+        ("near_due_hours", 12),
+        ("scheduler_interval_seconds", 120),
+        ("language", "es"),
+    ],
+)
+async def test_patch_config(client: AsgiClient, field: str, value):
     # Get current to use as base
-    current = (await client.get("/api/config")).json()
-    current["timezone"] = "Europe/London"
+    current = await _get_config(client)
+    current[field] = value
     r = await client.patch("/api/config", json=current)
     assert r.status_code == 200
     assert r.json()["ok"] is True
-    # Verify persistence
-    r2 = await client.get("/api/config")
-    assert r2.json()["timezone"] == "Europe/London"
-
-
-@pytest.mark.asyncio
-async def test_patch_config_notifications(client: AsyncClient):
-    current = (await client.get("/api/config")).json()
-    current["notifications_enabled"] = False
-    r = await client.patch("/api/config", json=current)
-    assert r.status_code == 200
-    r2 = await client.get("/api/config")
-    assert r2.json()["notifications_enabled"] is False
-
-
-@pytest.mark.asyncio
-async def test_patch_config_ntfy_topics(client: AsyncClient):
-    current = (await client.get("/api/config")).json()
-    current["ntfy_topics"] = "https://ntfy.sh/my-topic\nhttps://ntfy.sh/other"
-    r = await client.patch("/api/config", json=current)
-    assert r.status_code == 200
-    r2 = await client.get("/api/config")
-    assert "my-topic" in r2.json()["ntfy_topics"]
-
+    # PATCH reloads the settings from the database before replying
+    assert r.json()["settings"][field] == value
 
-@pytest.mark.asyncio
-async def test_patch_config_near_due_hours(client: AsyncClient):
-    current = (await client.get("/api/config")).json()
-    current["near_due_hours"] = 12
-    r = await client.patch("/api/config", json=current)
-    assert r.status_code == 200
-    r2 = await client.get("/api/config")
-    assert r2.json()["near_due_hours"] == 12
 
+# ── Load ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_patch_config_scheduler_interval(client: AsyncClient):
-    current = (await client.get("/api/config")).json()
-    current["scheduler_interval_seconds"] = 120
-    r = await client.patch("/api/config", json=current)
-    assert r.status_code == 200
-    r2 = await client.get("/api/config")
-    assert r2.json()["scheduler_interval_seconds"] == 120
-
-
-@pytest.mark.asyncio
-async def test_patch_config_language(client: AsyncClient):
-    current = (await client.get("/api/config")).json()
-    current["language"] = "es"
-    r = await client.patch("/api/config", json=current)
-    assert r.status_code == 200
-    r2 = await client.get("/api/config")
-    assert r2.json()["language"] == "es"
+@pytest.mark.parametrize("upsert", [True, False], ids=["on_conflict", "portable"])
+async def test_load_creates_settings_row_once(db_session, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(settings, "_UPSERT_INSERTS", {})
+    await settings._insert_default_row(db_session)
+    await settings._insert_default_row(db_session)   # losing a race is a no-op
+    cache = settings.SettingsCache(timezone="")
+    await cache.load(db_session)
+    assert cache.timezone == "UTC"
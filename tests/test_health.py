@@ -1,23 +1,39 @@
-import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app import db
+from tests.asgi_client import AsgiClient
 
-@pytest.mark.asyncio
-async def test_root(client: AsyncClient):
+
+@pytest_asyncio.fixture
+async def exhausted_pool(tmp_path, monkeypatch):
+    """Point the app at a one-connection pool and hold that connection."""
+    eng = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    monkeypatch.setattr(db, "SessionLocal", async_sessionmaker(eng, expire_on_commit=False))
+    monkeypatch.setattr(db, "DB_ACQUIRE_TIMEOUT", 0.05)
+    async with eng.connect():
+        yield
+    await eng.dispose()
+
+
+async def test_root(client: AsgiClient):
     r = await client.get("/")
     assert r.status_code == 200
     assert "msg" in r.json()
 
 
-@pytest.mark.asyncio
-async def test_health_live(client: AsyncClient):
+async def test_health_live(client: AsgiClient):
     r = await client.get("/health/live")
     assert r.status_code == 200
     assert r.json()["status"] == "alive"
 
 
-@pytest.mark.asyncio
-async def test_health_ready(client: AsyncClient):
+async def test_health_ready(client: AsgiClient):
     r = await client.get("/health/ready")
     assert r.status_code == 200
     body = r.json()
@@ -25,8 +41,7 @@ async def test_health_ready(client: AsyncClient):
     assert body["database"] == "connected"
 
 
-@pytest.mark.asyncio
-async def test_healthz(client: AsyncClient):
+async def test_healthz(client: AsgiClient):
     r = await client.get("/healthz")
     assert r.status_code == 200
     body = r.json()
@@ -35,3 +50,15 @@ async def test_healthz(client: AsyncClient):
     assert body["checks"]["database"]["status"] == "up"
     assert "python" in body["checks"]["platform"]
     assert "system" in body["checks"]["platform"]
+
+
+async def test_exhausted_pool_returns_503(http_client: AsgiClient, exhausted_pool):
+    r = await http_client.get("/api/tasks")
+    assert r.status_code == 503
+    assert r.json()["detail"] == "Database unavailable"
+
+
+async def test_health_ready_reports_exhausted_pool(http_client: AsgiClient, exhausted_pool):
+    r = await http_client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["status"] == "not ready"
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.limiter import SlidingWindowLimiter, limiter
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+
+async def _ok_app(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.fixture
+def limited_client(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setattr(limiter, "enabled", True)
+    mw = SlidingWindowLimiter(
+        _ok_app, rate=2, read_rate=3, window=60, prefixes=("/api/",)
+    )
+    return AsyncClient(transport=ASGITransport(app=mw), base_url="http://test")
+
+
+async def test_write_limit_enforced(limited_client: AsyncClient):
+    async with limited_client as ac:
+        assert (await ac.post("/api/x")).status_code == 200
+        assert (await ac.post("/api/x")).status_code == 200
+        r = await ac.post("/api/x")
+    assert r.status_code == 429
+    assert "Retry-After" in r.headers
+
+
+async def test_read_budget_separate(limited_client: AsyncClient):
+    async with limited_client as ac:
+        for _ in range(2):
+            await ac.post("/api/x")
+        codes = [(await ac.get("/api/x")).status_code for _ in range(4)]
+    assert codes == [200, 200, 200, 429]
+
+
+async def test_unmatched_prefix_not_limited(limited_client: AsyncClient):
+    async with limited_client as ac:
+        codes = [(await ac.post("/other")).status_code for _ in range(5)]
+    assert codes == [200] * 5
+
+
+async def test_routes_have_independent_budgets(limited_client: AsyncClient):
+    async with limited_client as ac:
+        for _ in range(2):
+            await ac.post("/api/x")
+        assert (await ac.post("/api/x")).status_code == 429
+        assert (await ac.post("/api/y")).status_code == 200
+
+
+@pytest.fixture
+def routed_client(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setattr(limiter, "enabled", True)
+    routes = [
+        Route("/api/items/{item_id}", _ok_app, methods=["POST"]),
+        Route("/api/items/{item_id}/files", _ok_app, methods=["POST"]),
+    ]
+    mw = SlidingWindowLimiter(
+        _ok_app,
+        rate=2,
+        window=60,
+        prefixes=("/api/",),
+        routes=routes,
+        exclude=("/api/items/{item_id}/files",),
+    )
+    return AsyncClient(transport=ASGITransport(app=mw), base_url="http://test")
+
+
+async def test_budget_keyed_by_route_template(routed_client: AsyncClient):
+    async with routed_client as ac:
+        codes = [(await ac.post(f"/api/items/{i}")).status_code for i in range(3)]
+    assert codes == [200, 200, 429]
+
+
+async def test_excluded_route_not_limited(routed_client: AsyncClient):
+    async with routed_client as ac:
+        codes = [(await ac.post("/api/items/1/files")).status_code for _ in range(5)]
+    assert codes == [200] * 5
@@ -1,11 +1,26 @@
+import pendulum
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import NotificationTemplate
+from app.services import notifications as svc
+from app.settings import settings_cache
+from tests.asgi_client import AsgiClient
+
+
+@pytest.fixture(autouse=True)
+def _clear_template_cache():
+    """The template cache is process-wide; each test gets a fresh database."""
+    svc._tmpl_cache.clear()
+    yield
+    svc._tmpl_cache.clear()
 
 
 # ── Templates ────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_get_template_missing(client: AsyncClient):
+async def test_get_template_missing(client: AsgiClient):
     """Getting a non-existent template returns empty markdown."""
     r = await client.get("/api/notifications/templates/due_soon")
     assert r.status_code == 200
@@ -14,8 +29,7 @@ async def test_get_template_missing(client: AsyncClient):
     assert body["markdown"] == ""
 
 
-@pytest.mark.asyncio
-async def test_patch_template_create(client: AsyncClient):
+async def test_patch_template_create(client: AsgiClient):
     """PATCH creates a template if it doesn't exist."""
     r = await client.patch(
         "/api/notifications/templates/due_soon",
@@ -29,8 +43,7 @@ async def test_patch_template_create(client: AsyncClient):
     assert "Custom" in r2.json()["markdown"]
 
 
-@pytest.mark.asyncio
-async def test_patch_template_update(client: AsyncClient):
+async def test_patch_template_update(client: AsgiClient):
     """PATCH updates an existing template."""
     await client.patch(
         "/api/notifications/templates/overdue", json={"markdown": "v1"}
@@ -42,56 +55,191 @@ async def test_patch_template_update(client: AsyncClient):
     assert r.json()["markdown"] == "v2"
 
 
+async def test_template_cached_until_invalidated(db_session):
+    assert await svc._get_template(db_session, "due_soon", "v1") == "v1"
+    row = (
+        await db_session.execute(
+            select(NotificationTemplate).where(NotificationTemplate.key == "due_soon")
+        )
+    ).scalar_one()
+    row.markdown = "v2"
+    await db_session.commit()
+    assert await svc._get_template(db_session, "due_soon", "v1") == "v1"
+    svc.invalidate_template("due_soon")
+    assert await svc._get_template(db_session, "due_soon", "v1") == "v2"
+
+
 # ── Logs ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_get_logs_empty(client: AsyncClient):
+async def test_get_logs_empty(client: AsgiClient):
     r = await client.get("/api/notifications/logs")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_get_logs_with_limit(client: AsyncClient):
+async def test_get_logs_with_limit(client: AsgiClient):
     r = await client.get("/api/notifications/logs", params={"limit": 10})
     assert r.status_code == 200
 
 
 # ── Cron ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_cron_no_topics(client: AsyncClient):
+async def test_cron_no_topics(client: AsgiClient):
     """Cron with no ntfy topics configured sends zero notifications."""
     r = await client.post("/api/notifications/cron", params={"mode": "both"})
     assert r.status_code == 200
     assert r.json()["sent"] == 0
 
 
-@pytest.mark.asyncio
-async def test_cron_near_due_mode(client: AsyncClient):
+async def test_cron_near_due_mode(client: AsgiClient):
     r = await client.post("/api/notifications/cron", params={"mode": "near_due"})
     assert r.status_code == 200
     assert "sent" in r.json()
 
 
-@pytest.mark.asyncio
-async def test_cron_overdue_mode(client: AsyncClient):
+async def test_cron_overdue_mode(client: AsgiClient):
     r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
     assert r.status_code == 200
     assert "sent" in r.json()
 
 
-@pytest.mark.asyncio
-async def test_cron_invalid_mode(client: AsyncClient):
+async def test_cron_invalid_mode(client: AsgiClient):
     r = await client.post("/api/notifications/cron", params={"mode": "invalid"})
     assert r.status_code == 422
 
 
 # ── Test endpoint ────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_test_notification_no_topics(client: AsyncClient):
+async def test_test_notification_no_topics(client: AsgiClient):
     """Test notification with no topics returns empty destinations."""
     r = await client.post("/api/notifications/test")
     assert r.status_code == 200
     assert r.json()["destinations"] == []
+
+
+TOPICS = ["https://ntfy.test/a", "https://ntfy.test/b"]
+
+
+@pytest_asyncio.fixture
+async def ntfy(request, monkeypatch):
+    """Configure two topics and route the shared client to a mock transport.
+
+    Parametrize indirectly with a set of topic URLs to make those answer 500.
+    """
+    import httpx  # only the tests that mock ntfy need it
+
+    down = getattr(request, "param", set())
+    posted = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        posted.append(str(req.url))
+        return httpx.Response(500 if str(req.url) in down else 200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(settings_cache, "ntfy_topics", "\n".join(TOPICS))
+    monkeypatch.setattr(settings_cache, "notifications_enabled", True)
+    monkeypatch.setattr(svc, "_client", client)
+    yield posted
+    await client.aclose()
+
+
+async def test_test_notification_fans_out(client: AsgiClient, ntfy):
+    """Every configured topic is posted to through the shared client."""
+    r = await client.post("/api/notifications/test")
+    assert r.json()["destinations"] == TOPICS
+    assert sorted(ntfy) == TOPICS
+
+
+async def test_cron_overdue_logs_each_destination(client: AsgiClient, ntfy):
+    """One log row per task and destination, written in a single insert."""
+    for title in ("Late 1", "Late 2"):
+        await client.post(
+            "/api/tasks", json={"title": title, "due_at": "2020-01-01T00:00:00"}
+        )
+    r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
+    assert r.json()["sent"] == 4
+    logs = (await client.get("/api/notifications/logs")).json()
+    assert len(logs) == 4
+    assert {log["kind"] for log in logs} == {"overdue"}
+    assert sorted({log["destination"] for log in logs}) == TOPICS
+
+
+@pytest.mark.parametrize("ntfy", [{TOPICS[1]}], indirect=True)
+async def test_cron_logs_topics_that_succeeded(client: AsgiClient, ntfy):
+    """A failing topic doesn't stop the others from being sent and logged."""
+    await client.post(
+        "/api/tasks", json={"title": "Late", "due_at": "2020-01-01T00:00:00"}
+    )
+    r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
+    assert r.json()["sent"] == 1
+    assert sorted(ntfy) == TOPICS
+    logs = (await client.get("/api/notifications/logs")).json()
+    assert [log["destination"] for log in logs] == [TOPICS[0]]
+
+
+async def test_cron_due_soon_window_and_dedup(client: AsgiClient, ntfy):
+    """Only tasks inside the near-due window notify, and only once a day."""
+    now = pendulum.now(settings_cache.timezone or "UTC").naive()
+    for title, delta in (("Soon", 2), ("Later", 24 * 30)):
+        due = now.add(hours=delta).isoformat()
+        await client.post("/api/tasks", json={"title": title, "due_at": due})
+    r = await client.post("/api/notifications/cron", params={"mode": "near_due"})
+    assert r.json()["sent"] == len(TOPICS)
+    r = await client.post("/api/notifications/cron", params={"mode": "near_due"})
+    assert r.json()["sent"] == 0
+
+
+async def test_cron_overdue_skips_recently_notified(client: AsgiClient, ntfy):
+    await client.post(
+        "/api/tasks", json={"title": "Late", "due_at": "2020-01-01T00:00:00"}
+    )
+    r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
+    assert r.json()["sent"] == len(TOPICS)
+    r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
+    assert r.json()["sent"] == 0
+
+
+async def test_cron_queues_for_worker(client: AsgiClient, ntfy, db_session, monkeypatch):
+    """With the worker running, cron only queues; logs land once it drains."""
+    monkeypatch.setattr(
+        svc,
+        "SessionLocal",
+        async_sessionmaker(
+            db_session.bind,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ),
+    )
+    await client.post(
+        "/api/tasks", json={"title": "Late", "due_at": "2020-01-01T00:00:00"}
+    )
+    svc.start_worker()
+    try:
+        r = await client.post("/api/notifications/cron", params={"mode": "overdue"})
+        assert r.json()["sent"] == len(TOPICS)
+    finally:
+        await svc.stop_worker()   # drains the queue before cancelling
+    assert sorted(ntfy) == TOPICS
+    logs = (await client.get("/api/notifications/logs")).json()
+    assert len(logs) == len(TOPICS)
+
+
+# ── Rendering ────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        svc.DEFAULT_DUE_SOON,
+        svc.DEFAULT_OVERDUE,
+        "{{literal}} {task_title}",
+        "{task_title!r:>12}",
+    ],
+)
+def test_render_matches_str_format(template):
+    kw = {
+        "task_title": "Pay rent",
+        "due_at": pendulum.datetime(2030, 1, 1, 9, 30),
+        "remaining": "3h",
+        "overdue_by": "5h",
+    }
+    assert svc._render(template, **kw) == template.format(**kw)
@@ -1,19 +1,12 @@
-import pytest
-from httpx import AsyncClient
-
-
-async def _create_task(client: AsyncClient, title: str = "Task") -> dict:
-    r = await client.post("/api/tasks", json={"title": title})
-    assert r.status_code == 200
-    return r.json()
+from tests.asgi_client import AsgiClient
+from tests.helpers import create_task
 
 
 # ── Create ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_create_generic_relationship(client: AsyncClient):
-    t1 = await _create_task(client, "Parent")
-    t2 = await _create_task(client, "Child")
+async def test_create_generic_relationship(client: AsgiClient):
+    t1 = await create_task(client, "Parent")
+    t2 = await create_task(client, "Child")
     r = await client.post(
         "/api/relationships",
         json={
@@ -27,10 +20,9 @@ async def test_create_generic_relationship(client: AsyncClient):
     assert r.json()["id"] > 0
 
 
-@pytest.mark.asyncio
-async def test_create_dependency_relationship(client: AsyncClient):
-    t1 = await _create_task(client, "Blocker")
-    t2 = await _create_task(client, "Blocked")
+async def test_create_dependency_relationship(client: AsgiClient):
+    t1 = await create_task(client, "Blocker")
+    t2 = await create_task(client, "Blocked")
     r = await client.post(
         "/api/relationships",
         json={
@@ -44,11 +36,10 @@ async def test_create_dependency_relationship(client: AsyncClient):
 
 # ── List ─────────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_list_relationships(client: AsyncClient):
-    t1 = await _create_task(client, "A")
-    t2 = await _create_task(client, "B")
-    t3 = await _create_task(client, "C")
+async def test_list_relationships(client: AsgiClient):
+    t1 = await create_task(client, "A")
+    t2 = await create_task(client, "B")
+    t3 = await create_task(client, "C")
     await client.post(
         "/api/relationships",
         json={"task_id": t1["id"], "related_task_id": t2["id"], "rel_type": "generic"},
@@ -66,15 +57,13 @@ async def test_list_relationships(client: AsyncClient):
     assert len(r.json()) == 2
 
 
-@pytest.mark.asyncio
-async def test_list_relationships_empty(client: AsyncClient):
-    t1 = await _create_task(client, "Solo")
+async def test_list_relationships_empty(client: AsgiClient):
+    t1 = await create_task(client, "Solo")
     r = await client.get("/api/relationships", params={"task_id": t1["id"]})
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_list_relationships_missing_param(client: AsyncClient):
+async def test_list_relationships_missing_param(client: AsgiClient):
     """task_id is required."""
     r = await client.get("/api/relationships")
     assert r.status_code == 422
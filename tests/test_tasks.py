@@ -1,23 +1,37 @@
+import pendulum
 import pytest
-from httpx import AsyncClient
+
+from app.routers.tasks import complete_task as _complete_task_ep
+from app.routers.tasks import create_task as _create_task_ep
+from app.schemas import TaskCreate
+from tests.asgi_client import AsgiClient
+from tests.helpers import create_tasks, post_task
+
+PAST = pendulum.datetime(2020, 1, 1)
+MINIMAL_TASK = {"title": "Default task"}
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
-async def _create_task(client: AsyncClient, **overrides) -> dict:
-    payload = {"title": "Default task", **overrides}
-    r = await client.post("/api/tasks", json=payload)
-    assert r.status_code == 200
-    return r.json()
+async def _insert_task(db_session, completed: bool = False, **overrides) -> dict:
+    """Create a setup task by awaiting the endpoint coroutines directly.
+
+    Skips routing, middleware and JSON encoding, and returns the same dict
+    as the HTTP response. The Create tests still go through post_task.
+    """
+    task = await _create_task_ep(TaskCreate(**{**MINIMAL_TASK, **overrides}), db=db_session)
+    if completed:
+        task = await _complete_task_ep(task.id, db=db_session)
+    return task.model_dump(mode="json")
 
 
-async def _create_category(client: AsyncClient, name: str = "Work") -> dict:
+async def _create_category(client: AsgiClient, name: str = "Work") -> dict:
     r = await client.post("/api/categories", json={"name": name})
     assert r.status_code == 200
     return r.json()
 
 
-async def _create_tag(client: AsyncClient, name: str = "urgent") -> dict:
+async def _create_tag(client: AsgiClient, name: str = "urgent") -> dict:
     r = await client.post("/api/tags", json={"name": name})
     assert r.status_code == 201
     return r.json()
@@ -25,9 +39,8 @@ async def _create_tag(client: AsyncClient, name: str = "urgent") -> dict:
 
 # ── Create ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_create_task_minimal(client: AsyncClient):
-    task = await _create_task(client, title="Buy milk")
+async def test_create_task_minimal(client: AsgiClient):
+    task = (await post_task(client, title="Buy milk")).json()
     assert task["id"] > 0
     assert task["title"] == "Buy milk"
     assert task["status"] == "pending"
@@ -37,66 +50,116 @@ async def test_create_task_minimal(client: AsyncClient):
     assert task["tag_ids"] == []
 
 
-@pytest.mark.asyncio
-async def test_create_task_with_description(client: AsyncClient):
-    task = await _create_task(client, title="T1", description="Some details")
+async def test_create_task_with_description(client: AsgiClient):
+    task = (await post_task(client, title="T1", description="Some details")).json()
     assert task["description"] == "Some details"
 
 
-@pytest.mark.asyncio
-async def test_create_task_with_category(client: AsyncClient):
+async def test_create_task_with_category(client: AsgiClient):
     cat = await _create_category(client)
-    task = await _create_task(client, title="T1", category_id=cat["id"])
+    task = (await post_task(client, title="T1", category_id=cat["id"])).json()
     assert task["category_id"] == cat["id"]
 
 
-@pytest.mark.asyncio
-async def test_create_task_with_tags(client: AsyncClient):
+async def test_create_task_with_tags(client: AsgiClient):
     t1 = await _create_tag(client, "alpha")
     t2 = await _create_tag(client, "beta")
-    task = await _create_task(client, title="Tagged", tag_ids=[t1["id"], t2["id"]])
+    task = (await post_task(client, title="Tagged", tag_ids=[t1["id"], t2["id"]])).json()
     assert set(task["tag_ids"]) == {t1["id"], t2["id"]}
 
 
-@pytest.mark.asyncio
-async def test_create_task_with_due_date(client: AsyncClient):
-    task = await _create_task(client, title="Due", due_at="2099-12-31T23:59:00")
+async def test_create_task_with_due_date(client: AsgiClient):
+    task = (await post_task(client, title="Due", due_at="2099-12-31T23:59:00")).json()
     assert task["due_at"] is not None
 
 
-@pytest.mark.asyncio
-async def test_create_task_invalid_category(client: AsyncClient):
+async def test_create_task_invalid_category(client: AsgiClient):
     r = await client.post("/api/tasks", json={"title": "T", "category_id": 9999})
     assert r.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_create_task_invalid_tags(client: AsyncClient):
+async def test_create_task_invalid_tags(client: AsgiClient):
     r = await client.post("/api/tasks", json={"title": "T", "tag_ids": [9999]})
     assert r.status_code == 400
 
 
+# ── Bulk create ──────────────────────────────────────────────────────────────
+
+async def test_bulk_create_tasks(client: AsgiClient):
+    cat = await _create_category(client)
+    tag = await _create_tag(client)
+    r = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"title": "B1"},
+        {"title": "B2", "category_id": cat["id"], "tag_ids": [tag["id"]]},
+    ]})
+    assert r.status_code == 200
+    body = r.json()
+    assert [t["title"] for t in body] == ["B1", "B2"]
+    assert all(t["id"] > 0 and t["status"] == "pending" for t in body)
+    assert body[1]["category_id"] == cat["id"]
+    assert body[1]["tag_ids"] == [tag["id"]]
+
+
+async def test_list_and_single_serialize_identically(client: AsgiClient):
+    """List endpoints use TaskOutFast; the bytes must match TaskOut's."""
+    cat = await _create_category(client, "Fmt")
+    tag = await _create_tag(client, "fmt")
+    single = await post_task(
+        client,
+        title="Fmt",
+        due_at="2099-01-01T10:00:00Z",
+        category_id=cat["id"],
+        tag_ids=[tag["id"]],
+    )
+    for url in (
+        "/api/tasks",
+        f"/api/categories/{cat['id']}/tasks",
+        f"/api/tags/{tag['id']}/tasks",
+    ):
+        listed = await client.get(url)
+        assert listed.content == b"[" + single.content + b"]", url
+    bulk = await client.post(
+        "/api/tasks/bulk",
+        json={"tasks": [{"title": "Bulk", "due_at": "2099-01-01T10:00:00Z"}]},
+    )
+    bulk_task = bulk.json()[0]
+    assert bulk_task["due_at"] == single.json()["due_at"]
+
+
+async def test_bulk_create_is_all_or_nothing(client: AsgiClient):
+    r = await client.post("/api/tasks/bulk", json={"tasks": [
+        {"title": "Ok"},
+        {"title": "Bad", "tag_ids": [9999]},
+    ]})
+    assert r.status_code == 400
+    assert (await client.get("/api/tasks")).json() == []
+
+
+@pytest.mark.slow
+async def test_bulk_create_1000_tasks(client: AsgiClient):
+    tasks = [{"title": f"S{i}"} for i in range(1000)]
+    r = await client.post("/api/tasks/bulk", json={"tasks": tasks})
+    assert r.status_code == 200
+    r = await client.get("/api/tasks")
+    assert len(r.json()) >= 1000
+
+
 # ── List / Filter ────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_list_tasks_empty(client: AsyncClient):
+async def test_list_tasks_empty(client: AsgiClient):
     r = await client.get("/api/tasks")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_list_tasks_returns_created(client: AsyncClient):
-    await _create_task(client, title="A")
-    await _create_task(client, title="B")
+async def test_list_tasks_returns_created(client: AsgiClient):
+    await create_tasks(client, {"title": "A"}, {"title": "B"})
     r = await client.get("/api/tasks")
     assert len(r.json()) == 2
 
 
-@pytest.mark.asyncio
-async def test_list_tasks_filter_by_status(client: AsyncClient):
-    task = await _create_task(client, title="X")
-    await client.post(f"/api/tasks/{task['id']}/complete")
+async def test_list_tasks_filter_by_status(client: AsgiClient, db_session):
+    await _insert_task(db_session, completed=True, title="X")
     r = await client.get("/api/tasks", params={"status": "completed"})
     assert all(t["status"] == "completed" for t in r.json())
 
@@ -104,38 +167,34 @@ async def test_list_tasks_filter_by_status(client: AsyncClient):
     assert all(t["status"] == "pending" for t in r2.json())
 
 
-@pytest.mark.asyncio
-async def test_list_tasks_filter_by_category(client: AsyncClient):
+async def test_list_tasks_filter_by_category(client: AsgiClient):
     cat = await _create_category(client, "Home")
-    await _create_task(client, title="With cat", category_id=cat["id"])
-    await _create_task(client, title="No cat")
+    await post_task(client, title="With cat", category_id=cat["id"])
+    await post_task(client, title="No cat")
     r = await client.get("/api/tasks", params={"category": cat["id"]})
     assert len(r.json()) == 1
     assert r.json()[0]["category_id"] == cat["id"]
 
 
-@pytest.mark.asyncio
-async def test_list_tasks_filter_by_tag(client: AsyncClient):
+async def test_list_tasks_filter_by_tag(client: AsgiClient, db_session):
     tag = await _create_tag(client, "vip")
-    task = await _create_task(client, title="Tagged", tag_ids=[tag["id"]])
-    await _create_task(client, title="Not tagged")
+    task = await _insert_task(db_session, title="Tagged", tag_ids=[tag["id"]])
+    await post_task(client, title="Not tagged")
     r = await client.get("/api/tasks", params={"tag": tag["id"]})
     assert len(r.json()) == 1
     assert r.json()[0]["id"] == task["id"]
 
 
-@pytest.mark.asyncio
-async def test_list_tasks_text_search(client: AsyncClient):
-    await _create_task(client, title="Buy groceries")
-    await _create_task(client, title="Clean house")
+async def test_list_tasks_text_search(client: AsgiClient):
+    await post_task(client, title="Buy groceries")
+    await post_task(client, title="Clean house")
     r = await client.get("/api/tasks", params={"q": "groceries"})
     assert len(r.json()) == 1
     assert "groceries" in r.json()[0]["title"].lower()
 
 
-@pytest.mark.asyncio
-async def test_list_all_alias(client: AsyncClient):
-    await _create_task(client, title="A1")
+async def test_list_all_alias(client: AsgiClient):
+    await post_task(client, title="A1")
     r = await client.get("/api/tasks/all")
     assert r.status_code == 200
     assert len(r.json()) == 1
@@ -143,32 +202,28 @@ async def test_list_all_alias(client: AsyncClient):
 
 # ── Search ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_search_by_title(client: AsyncClient):
-    await _create_task(client, title="Unique needle")
-    await _create_task(client, title="Other task")
+async def test_search_by_title(client: AsgiClient):
+    await post_task(client, title="Unique needle")
+    await post_task(client, title="Other task")
     r = await client.get("/api/tasks/search", params={"q": "needle"})
     assert len(r.json()) == 1
 
 
-@pytest.mark.asyncio
-async def test_search_by_description(client: AsyncClient):
-    await _create_task(client, title="T1", description="hidden gem here")
+async def test_search_by_description(client: AsgiClient):
+    await post_task(client, title="T1", description="hidden gem here")
     r = await client.get("/api/tasks/search", params={"q": "hidden gem"})
     assert len(r.json()) == 1
 
 
-@pytest.mark.asyncio
-async def test_search_no_results(client: AsyncClient):
-    await _create_task(client, title="Something")
+async def test_search_no_results(client: AsgiClient):
+    await post_task(client, title="Something")
     r = await client.get("/api/tasks/search", params={"q": "nonexistent"})
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_search_sql_injection(client: AsyncClient):
+async def test_search_sql_injection(client: AsgiClient):
     """SQL injection attempts must not crash or drop tables."""
-    await _create_task(client, title="Safe task")
+    await post_task(client, title="Safe task")
     r = await client.get("/api/tasks/search", params={"q": "%'; DROP TABLE tasks; --"})
     assert r.status_code == 200
     # Table still intact
@@ -179,14 +234,16 @@ async def test_search_sql_injection(client: AsyncClient):
 
 # ── Overdue ──────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_overdue_endpoint(client: AsyncClient):
-    # Past due date → should appear in overdue
-    await _create_task(client, title="Past", due_at="2020-01-01T00:00:00")
-    # Future due date → should NOT appear
-    await _create_task(client, title="Future", due_at="2099-01-01T00:00:00")
-    # No due date → should NOT appear
-    await _create_task(client, title="NoDue")
+async def test_overdue_endpoint(client: AsgiClient):
+    await create_tasks(
+        client,
+        # Past due date → should appear in overdue
+        {"title": "Past", "due_at": "2020-01-01T00:00:00"},
+        # Future due date → should NOT appear
+        {"title": "Future", "due_at": "2099-01-01T00:00:00"},
+        # No due date → should NOT appear
+        {"title": "NoDue"},
+    )
     r = await client.get("/api/tasks/overdue")
     assert r.status_code == 200
     titles = [t["title"] for t in r.json()]
@@ -195,30 +252,25 @@ async def test_overdue_endpoint(client: AsyncClient):
     assert "NoDue" not in titles
 
 
-@pytest.mark.asyncio
-async def test_overdue_excludes_completed(client: AsyncClient):
-    task = await _create_task(client, title="Done", due_at="2020-01-01T00:00:00")
-    await client.post(f"/api/tasks/{task['id']}/complete")
+async def test_overdue_excludes_completed(client: AsgiClient, db_session):
+    await _insert_task(db_session, completed=True, title="Done", due_at=PAST)
     r = await client.get("/api/tasks/overdue")
     assert len(r.json()) == 0
 
 
 # ── Next window ──────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_next_window_default(client: AsyncClient):
+async def test_next_window_default(client: AsgiClient):
     """Default window is 48 hours; far-future tasks excluded."""
-    await _create_task(client, title="Far", due_at="2099-06-01T00:00:00")
+    await post_task(client, title="Far", due_at="2099-06-01T00:00:00")
     r = await client.get("/api/tasks/next")
     assert r.status_code == 200
     # Far future task should not appear in 48h window
     assert all(t["title"] != "Far" for t in r.json())
 
 
-@pytest.mark.asyncio
-async def test_next_window_excludes_completed(client: AsyncClient):
-    task = await _create_task(client, title="Comp", due_at="2020-01-01T00:00:00")
-    await client.post(f"/api/tasks/{task['id']}/complete")
+async def test_next_window_excludes_completed(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, completed=True, title="Comp", due_at=PAST)
     r = await client.get("/api/tasks/next", params={"hours": 999999})
     ids = [t["id"] for t in r.json()]
     assert task["id"] not in ids
@@ -226,9 +278,8 @@ async def test_next_window_excludes_completed(client: AsyncClient):
 
 # ── Complete / Toggle ────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_complete_task(client: AsyncClient):
-    task = await _create_task(client, title="Toggle me")
+async def test_complete_task(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="Toggle me")
     assert task["status"] == "pending"
 
     r = await client.post(f"/api/tasks/{task['id']}/complete")
@@ -240,139 +291,120 @@ async def test_complete_task(client: AsyncClient):
     assert r2.json()["status"] == "pending"
 
 
-@pytest.mark.asyncio
-async def test_complete_task_not_found(client: AsyncClient):
+async def test_complete_task_not_found(client: AsgiClient):
     r = await client.post("/api/tasks/9999/complete")
     assert r.status_code == 404
 
 
 # ── Delete ───────────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_delete_completed_task(client: AsyncClient):
-    task = await _create_task(client, title="Del me")
-    await client.post(f"/api/tasks/{task['id']}/complete")
+async def test_delete_completed_task(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, completed=True, title="Del me")
     r = await client.delete(f"/api/tasks/{task['id']}")
     assert r.status_code == 200
     assert "deleted_task" in r.json()
 
 
-@pytest.mark.asyncio
-async def test_delete_pending_task_blocked(client: AsyncClient):
-    task = await _create_task(client, title="Pending")
+async def test_delete_pending_task_blocked(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="Pending")
     r = await client.delete(f"/api/tasks/{task['id']}")
     assert r.status_code == 409
 
 
-@pytest.mark.asyncio
-async def test_delete_pending_task_force(client: AsyncClient):
-    task = await _create_task(client, title="Forced")
+async def test_delete_pending_task_force(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="Forced")
     r = await client.delete(f"/api/tasks/{task['id']}", params={"force": True})
     assert r.status_code == 200
 
 
-@pytest.mark.asyncio
-async def test_delete_task_not_found(client: AsyncClient):
+async def test_delete_task_not_found(client: AsgiClient):
     r = await client.delete("/api/tasks/9999", params={"force": True})
     assert r.status_code == 404
 
 
 # ── Patch (general) ─────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_patch_task_title(client: AsyncClient):
-    task = await _create_task(client, title="Old title")
+async def test_patch_task_title(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="Old title")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"title": "New title"})
     assert r.status_code == 200
     assert r.json()["title"] == "New title"
 
 
-@pytest.mark.asyncio
-async def test_patch_task_description(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_patch_task_description(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"description": "Added"})
     assert r.json()["description"] == "Added"
 
 
-@pytest.mark.asyncio
-async def test_patch_task_clear_description(client: AsyncClient):
-    task = await _create_task(client, title="T", description="Has desc")
+async def test_patch_task_clear_description(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T", description="Has desc")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"description": None})
     assert r.json()["description"] is None
 
 
-@pytest.mark.asyncio
-async def test_patch_task_status(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_patch_task_status(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"})
     assert r.json()["status"] == "completed"
 
 
-@pytest.mark.asyncio
-async def test_patch_task_category(client: AsyncClient):
+async def test_patch_task_category(client: AsgiClient, db_session):
     cat = await _create_category(client, "Errands")
-    task = await _create_task(client, title="T")
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"category_id": cat["id"]})
     assert r.json()["category_id"] == cat["id"]
 
 
-@pytest.mark.asyncio
-async def test_patch_task_clear_category(client: AsyncClient):
+async def test_patch_task_clear_category(client: AsgiClient, db_session):
     cat = await _create_category(client)
-    task = await _create_task(client, title="T", category_id=cat["id"])
+    task = await _insert_task(db_session, title="T", category_id=cat["id"])
     r = await client.patch(f"/api/tasks/{task['id']}", json={"category_id": None})
     assert r.json()["category_id"] is None
 
 
-@pytest.mark.asyncio
-async def test_patch_task_tags(client: AsyncClient):
+async def test_patch_task_tags(client: AsgiClient, db_session):
     t1 = await _create_tag(client, "a")
     t2 = await _create_tag(client, "b")
-    task = await _create_task(client, title="T", tag_ids=[t1["id"]])
+    task = await _insert_task(db_session, title="T", tag_ids=[t1["id"]])
     # Replace tags entirely
     r = await client.patch(f"/api/tasks/{task['id']}", json={"tag_ids": [t2["id"]]})
     assert r.json()["tag_ids"] == [t2["id"]]
 
 
-@pytest.mark.asyncio
-async def test_patch_task_clear_tags(client: AsyncClient):
+async def test_patch_task_clear_tags(client: AsgiClient, db_session):
     tag = await _create_tag(client, "x")
-    task = await _create_task(client, title="T", tag_ids=[tag["id"]])
+    task = await _insert_task(db_session, title="T", tag_ids=[tag["id"]])
     r = await client.patch(f"/api/tasks/{task['id']}", json={"tag_ids": None})
     assert r.json()["tag_ids"] == []
 
 
-@pytest.mark.asyncio
-async def test_patch_task_invalid_category(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_patch_task_invalid_category(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"category_id": 9999})
     assert r.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_patch_task_invalid_tags(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_patch_task_invalid_tags(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"tag_ids": [9999]})
     assert r.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_patch_task_not_found(client: AsyncClient):
+async def test_patch_task_not_found(client: AsgiClient):
     r = await client.patch("/api/tasks/9999", json={"title": "X"})
     assert r.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_patch_task_no_fields_is_noop(client: AsyncClient):
-    task = await _create_task(client, title="Original")
+async def test_patch_task_no_fields_is_noop(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="Original")
     r = await client.patch(f"/api/tasks/{task['id']}", json={})
     assert r.status_code == 200
     assert r.json()["title"] == "Original"
 
 
-@pytest.mark.asyncio
-async def test_patch_task_due_at(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_patch_task_due_at(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(
         f"/api/tasks/{task['id']}", json={"due_at": "2099-06-15T10:00:00"}
     )
@@ -380,18 +412,16 @@ async def test_patch_task_due_at(client: AsyncClient):
     assert r.json()["due_at"] is not None
 
 
-@pytest.mark.asyncio
-async def test_patch_task_clear_due(client: AsyncClient):
-    task = await _create_task(client, title="T", due_at="2099-01-01T00:00:00")
+async def test_patch_task_clear_due(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T", due_at="2099-01-01T00:00:00")
     r = await client.patch(f"/api/tasks/{task['id']}", json={"due_at": None})
     assert r.json()["due_at"] is None
 
 
 # ── Description sub-endpoint ─────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_set_description_endpoint(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_set_description_endpoint(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(
         f"/api/tasks/{task['id']}/description", json={"description": "Updated"}
     )
@@ -399,17 +429,15 @@ async def test_set_description_endpoint(client: AsyncClient):
     assert r.json()["description"] == "Updated"
 
 
-@pytest.mark.asyncio
-async def test_set_description_not_found(client: AsyncClient):
+async def test_set_description_not_found(client: AsgiClient):
     r = await client.patch("/api/tasks/9999/description", json={"description": "X"})
     assert r.status_code == 404
 
 
 # ── Due sub-endpoint ─────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_set_due_endpoint(client: AsyncClient):
-    task = await _create_task(client, title="T")
+async def test_set_due_endpoint(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T")
     r = await client.patch(
         f"/api/tasks/{task['id']}/due", json={"due_at": "2099-06-15T10:00:00"}
     )
@@ -417,26 +445,23 @@ async def test_set_due_endpoint(client: AsyncClient):
     assert r.json()["due_at"] is not None
 
 
-@pytest.mark.asyncio
-async def test_set_due_nullify(client: AsyncClient):
-    task = await _create_task(client, title="T", due_at="2099-01-01T00:00:00")
+async def test_set_due_nullify(client: AsgiClient, db_session):
+    task = await _insert_task(db_session, title="T", due_at="2099-01-01T00:00:00")
     r = await client.patch(f"/api/tasks/{task['id']}/due", json={"due_at": None})
     assert r.status_code == 200
     assert r.json()["due_at"] is None
 
 
-@pytest.mark.asyncio
-async def test_set_due_not_found(client: AsyncClient):
+async def test_set_due_not_found(client: AsgiClient):
     r = await client.patch("/api/tasks/9999/due", json={"due_at": None})
     assert r.status_code == 404
 
 
 # ── Add / Remove tags ────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_add_tags_to_task(client: AsyncClient):
+async def test_add_tags_to_task(client: AsgiClient, db_session):
     tag = await _create_tag(client, "new-tag")
-    task = await _create_task(client, title="T")
+    task = await _insert_task(db_session, title="T")
     r = await client.post(
         f"/api/tasks/{task['id']}/tags", json={"tag_ids": [tag["id"]]}
     )
@@ -444,40 +469,35 @@ async def test_add_tags_to_task(client: AsyncClient):
     assert tag["id"] in r.json()["tag_ids"]
 
 
-@pytest.mark.asyncio
-async def test_add_tags_prevents_duplicates(client: AsyncClient):
+async def test_add_tags_prevents_duplicates(client: AsgiClient, db_session):
     tag = await _create_tag(client, "dup")
-    task = await _create_task(client, title="T", tag_ids=[tag["id"]])
+    task = await _insert_task(db_session, title="T", tag_ids=[tag["id"]])
     r = await client.post(
         f"/api/tasks/{task['id']}/tags", json={"tag_ids": [tag["id"]]}
     )
     assert r.json()["tag_ids"].count(tag["id"]) == 1
 
 
-@pytest.mark.asyncio
-async def test_add_tags_task_not_found(client: AsyncClient):
+async def test_add_tags_task_not_found(client: AsgiClient):
     r = await client.post("/api/tasks/9999/tags", json={"tag_ids": [1]})
     assert r.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_remove_tag_from_task(client: AsyncClient):
+async def test_remove_tag_from_task(client: AsgiClient, db_session):
     tag = await _create_tag(client, "removable")
-    task = await _create_task(client, title="T", tag_ids=[tag["id"]])
+    task = await _insert_task(db_session, title="T", tag_ids=[tag["id"]])
     r = await client.delete(f"/api/tasks/{task['id']}/tags/{tag['id']}")
     assert r.status_code == 200
     assert tag["id"] not in r.json()["tag_ids"]
 
 
-@pytest.mark.asyncio
-async def test_remove_tag_not_on_task(client: AsyncClient):
+async def test_remove_tag_not_on_task(client: AsgiClient, db_session):
     tag = await _create_tag(client, "orphan")
-    task = await _create_task(client, title="T")
+    task = await _insert_task(db_session, title="T")
     r = await client.delete(f"/api/tasks/{task['id']}/tags/{tag['id']}")
     assert r.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_remove_tag_task_not_found(client: AsyncClient):
+async def test_remove_tag_task_not_found(client: AsgiClient):
     r = await client.delete("/api/tasks/9999/tags/1")
     assert r.status_code == 404
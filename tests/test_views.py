@@ -1,68 +1,59 @@
-import pytest
-from httpx import AsyncClient
+import pytest_asyncio
 
-
-async def _create_task(client: AsyncClient, **overrides) -> dict:
-    payload = {"title": "Task", **overrides}
-    r = await client.post("/api/tasks", json=payload)
-    assert r.status_code == 200
-    return r.json()
+from app.models import Category, Tag
+from tests.asgi_client import AsgiClient
+from tests.helpers import create_tasks, seed_named
 
 
-async def _create_category(client: AsyncClient, name: str) -> dict:
-    r = await client.post("/api/categories", json={"name": name})
-    assert r.status_code == 200
-    return r.json()
+@pytest_asyncio.fixture
+async def home_category(db_session) -> int:
+    """Id of a "Home" category inserted through the ORM instead of a POST."""
+    return (await seed_named(db_session, Category, "Home"))["Home"]
 
 
-async def _create_tag(client: AsyncClient, name: str) -> dict:
-    r = await client.post("/api/tags", json={"name": name})
-    assert r.status_code == 201
-    return r.json()
+@pytest_asyncio.fixture
+async def hot_tag(db_session) -> int:
+    """Id of a "hot" tag inserted through the ORM instead of a POST."""
+    return (await seed_named(db_session, Tag, "hot"))["hot"]
 
 
 # ── Categories summary ───────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_categories_summary_empty(client: AsyncClient):
+async def test_categories_summary_empty(client: AsgiClient):
     r = await client.get("/api/views/categories-summary")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_categories_summary_with_data(client: AsyncClient):
-    cat = await _create_category(client, "Home")
-    await _create_task(client, title="T1", category_id=cat["id"])
-    await _create_task(client, title="T2", category_id=cat["id"])
+async def test_categories_summary_with_data(client: AsgiClient, home_category: int):
+    await create_tasks(
+        client,
+        {"title": "T1", "category_id": home_category},
+        {"title": "T2", "category_id": home_category},
+    )
     r = await client.get("/api/views/categories-summary")
     items = r.json()
     home = next(i for i in items if i["key"] == "Home")
     assert home["count"] == 2
 
 
-@pytest.mark.asyncio
-async def test_categories_summary_empty_category(client: AsyncClient):
+async def test_categories_summary_empty_category(client: AsgiClient, home_category: int):
     """A category with zero tasks should still appear with count 0."""
-    await _create_category(client, "Empty")
     r = await client.get("/api/views/categories-summary")
-    empty = next(i for i in r.json() if i["key"] == "Empty")
-    assert empty["count"] == 0
+    home = next(i for i in r.json() if i["key"] == "Home")
+    assert home["count"] == 0
 
 
 # ── Status summary ───────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_status_summary_empty(client: AsyncClient):
+async def test_status_summary_empty(client: AsgiClient):
     r = await client.get("/api/views/status-summary")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_status_summary_mixed(client: AsyncClient):
-    t1 = await _create_task(client, title="A")
-    await _create_task(client, title="B")
+async def test_status_summary_mixed(client: AsgiClient):
+    t1, _ = await create_tasks(client, {"title": "A"}, {"title": "B"})
     await client.post(f"/api/tasks/{t1['id']}/complete")
     r = await client.get("/api/views/status-summary")
     items = {i["key"]: i["count"] for i in r.json()}
@@ -72,28 +63,26 @@ async def test_status_summary_mixed(client: AsyncClient):
 
 # ── Tags summary ─────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_tags_summary_empty(client: AsyncClient):
+async def test_tags_summary_empty(client: AsgiClient):
     r = await client.get("/api/views/tags-summary")
     assert r.status_code == 200
     assert r.json() == []
 
 
-@pytest.mark.asyncio
-async def test_tags_summary_with_data(client: AsyncClient):
-    tag = await _create_tag(client, "hot")
-    await _create_task(client, title="T1", tag_ids=[tag["id"]])
-    await _create_task(client, title="T2", tag_ids=[tag["id"]])
+async def test_tags_summary_with_data(client: AsgiClient, hot_tag: int):
+    await create_tasks(
+        client,
+        {"title": "T1", "tag_ids": [hot_tag]},
+        {"title": "T2", "tag_ids": [hot_tag]},
+    )
     r = await client.get("/api/views/tags-summary")
     items = r.json()
     hot = next(i for i in items if i["key"] == "hot")
     assert hot["count"] == 2
 
 
-@pytest.mark.asyncio
-async def test_tags_summary_unused_tag(client: AsyncClient):
+async def test_tags_summary_unused_tag(client: AsgiClient, hot_tag: int):
     """A tag with no tasks should appear with count 0."""
-    await _create_tag(client, "orphan")
     r = await client.get("/api/views/tags-summary")
-    orphan = next(i for i in r.json() if i["key"] == "orphan")
-    assert orphan["count"] == 0
+    hot = next(i for i in r.json() if i["key"] == "hot")
+    assert hot["count"] == 0